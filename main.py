@@ -22,12 +22,23 @@ try:
 except ImportError:
     HAS_QASYNC = False
 
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 from src.ui.main_window import MainWindow
 from src.ui.theme import DARK_THEME
 
 
 def main():
     """Application entry point."""
+    # qasync drives its own Qt-integrated loop. Without it, any event loop the
+    # app creates for one-off coroutines should be the faster uvloop.
+    if not HAS_QASYNC and HAS_UVLOOP:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     # Enable high DPI scaling
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
@@ -6,7 +6,7 @@ from src.core.proxy_manager import ProxyManager
 from src.core.diff_detector import DiffDetector, DiffStatus, DiffSummary
 from src.core.transforms import TransformPipeline, create_pipeline_from_config
 from src.core.templates import TEMPLATES, get_template, list_templates
-from src.core.exporter import ExporterFactory, CSVExporter, JSONExporter, SQLiteExporter
+from src.core.exporter import ExporterFactory, CSVExporter, JSONExporter, SQLiteExporter, Schema
 
 __all__ = [
     'ScraperOrchestrator',
@@ -24,4 +24,5 @@ __all__ = [
     'CSVExporter',
     'JSONExporter',
     'SQLiteExporter',
+    'Schema',
 ]
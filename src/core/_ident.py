@@ -0,0 +1,27 @@
+"""Identifier sanitizing shared by exporters and history storage."""
+
+
+class _SanitizeTable(dict):
+    """str.translate table that keeps alphanumerics and '_' and maps anything else to '_'.
+
+    Entries are filled in on first sight of each codepoint, so repeated
+    characters are a plain C-level dict lookup.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        value = char if char.isalnum() or char == "_" else "_"
+        self[codepoint] = value
+        return value
+
+
+# Pre-seed ASCII so common names never reach __missing__
+_TABLE = _SanitizeTable()
+for _codepoint in range(128):
+    _TABLE[_codepoint]
+del _codepoint
+
+
+def sanitize(name: str) -> str:
+    """Replace every character that isn't alphanumeric or '_' with '_'."""
+    return name.translate(_TABLE)
@@ -0,0 +1,26 @@
+"""Shared JSON serialization helpers for scraped data."""
+
+from pathlib import PurePath
+from typing import Any
+
+try:
+    import orjson
+    # datetime, UUID, dataclasses and enums are native to orjson; numpy
+    # values need the flag. Only other types reach json_default().
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    ORJSON_OPTIONS = 0
+
+
+def json_default(obj: Any) -> Any:
+    """Encode types that neither orjson nor json handle natively."""
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        # Sorted so record hashes don't depend on set iteration order
+        try:
+            return sorted(obj)
+        except TypeError:
+            return list(obj)
+    # Anything else is stringified, as with the previous default=str
+    return str(obj)
@@ -2,12 +2,50 @@
 
 import hashlib
 import json
-from datetime import datetime
+import operator
+import os
+import shutil
+from datetime import date, datetime, time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Any
+from typing import Any, Callable, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
+from src.core._ident import sanitize
+from src.core._serialize import ORJSON_OPTIONS, json_default
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+# Stored with each run so history written with another digest or serializer
+# gets rehashed on load (orjson and json format the same record differently)
+HASH_ALGO = ("xxh3_64" if HAS_XXHASH else "blake2b_64") + ("+orjson" if HAS_ORJSON else "+json")
+
+
+def _hash_default(obj: Any) -> Any:
+    """json default matching orjson's output for types it encodes natively."""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    return json_default(obj)
+
+
+@lru_cache(maxsize=128)
+def _safe_project_name(project_name: str) -> str:
+    """Make a project name safe for use as a file name."""
+    return sanitize(project_name)
+
 
 class DiffStatus(str, Enum):
     NEW = "new"
@@ -50,25 +88,79 @@ class DiffDetector:
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
 
-    def _get_history_path(self, project_name: str) -> Path:
-        """Get path to history file for a project."""
-        safe_name = "".join(c if c.isalnum() else "_" for c in project_name)
-        return self.storage_dir / f"{safe_name}_history.json"
+    def _get_history_dir(self, project_name: str) -> Path:
+        """Get directory holding the run files and index for a project."""
+        return self.storage_dir / _safe_project_name(project_name)
+
+    def _get_legacy_history_path(self, project_name: str) -> Path:
+        """Get path to the old single-file history for a project."""
+        return self.storage_dir / f"{_safe_project_name(project_name)}_history.json"
 
     def _compute_record_hash(self, data: dict) -> str:
         """Compute hash of a record for comparison."""
-        content = json.dumps(data, sort_keys=True, default=str)
-        return hashlib.md5(content.encode()).hexdigest()
+        if HAS_ORJSON:
+            content = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | ORJSON_OPTIONS, default=json_default)
+        else:
+            # Same bytes orjson would produce, so a record hashes alike
+            # with or without orjson installed
+            content = json.dumps(
+                data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_hash_default
+            ).encode()
+        # Content fingerprint only - no need for a cryptographic hash
+        if HAS_XXHASH:
+            return xxhash.xxh3_64(content).hexdigest()
+        return hashlib.blake2b(content, digest_size=8).hexdigest()
 
     def _get_record_key(self, data: dict, key_fields: list[str] = None) -> str:
         """Get unique key for a record."""
         if key_fields:
-            key_parts = [str(data.get(f, "")) for f in key_fields]
-            return "|".join(key_parts)
+            return self._make_key_fn(key_fields)(data)
         else:
             # Use hash of entire record as key
             return self._compute_record_hash(data)
 
+    def _make_key_fn(self, key_fields: list[str]) -> Callable[[dict], str]:
+        """Build a record -> key function specialized for fixed key fields.
+
+        Built once per compare/save so the per-record loop doesn't re-check
+        key_fields or rebuild the field lookup for every record.
+        """
+        if len(key_fields) == 1:
+            field_name = key_fields[0]
+            return lambda data: str(data.get(field_name, ""))
+
+        getter = operator.itemgetter(*key_fields)
+
+        def key_fn(data: dict) -> str:
+            try:
+                values = getter(data)
+            except KeyError:
+                values = [data.get(f, "") for f in key_fields]
+            return "|".join(map(str, values))
+
+        return key_fn
+
+    def _build_records_map(
+        self,
+        results: list[dict],
+        key_fields: list[str] = None
+    ) -> dict[str, dict]:
+        """Hash each record once and map its key to {"data", "hash"}.
+
+        Without key_fields, records are keyed by their own hash.
+        """
+        compute_hash = self._compute_record_hash
+        records = {}
+        if key_fields:
+            key_fn = self._make_key_fn(key_fields)
+            for record in results:
+                records[key_fn(record)] = {"data": record, "hash": compute_hash(record)}
+        else:
+            for record in results:
+                record_hash = compute_hash(record)
+                records[record_hash] = {"data": record, "hash": record_hash}
+        return records
+
     def save_results(
         self,
         project_name: str,
@@ -76,41 +168,182 @@ class DiffDetector:
         key_fields: list[str] = None
     ):
         """Save current results for future comparison."""
-        history_path = self._get_history_path(project_name)
-
-        # Load existing history
-        history = self._load_history(history_path)
-
-        # Add current run
+        history_dir = self._get_history_dir(project_name)
+        index = self._load_index(project_name, migrate_legacy=True)
+        records = self._build_records_map(results, key_fields)
+        self._write_run(history_dir, index, records)
+
+    def _write_json(self, path: Path, data: Any, indent: bool = True):
+        """Write JSON atomically via a temp file and rename.
+
+        The payload is serialized in one go and written through a large
+        buffer, so a crash mid-write never leaves a truncated file behind.
+        """
+        if HAS_ORJSON:
+            option = (orjson.OPT_INDENT_2 if indent else 0) | ORJSON_OPTIONS
+            payload = orjson.dumps(data, option=option, default=json_default)
+        elif indent:
+            payload = json.dumps(data, indent=2, default=json_default).encode()
+        else:
+            payload = json.dumps(data, separators=(",", ":"), default=json_default).encode()
+
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, 'wb', buffering=4 * 1024 * 1024) as f:
+            f.write(payload)
+            f.write(b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _read_json(self, path: Path) -> Any:
+        """Read a JSON file written by _write_json."""
+        # Both parsers take UTF-8 bytes directly - no text-mode decoding layer
+        if HAS_ORJSON:
+            return orjson.loads(path.read_bytes())
+        return json.loads(path.read_bytes())
+
+    def _write_run(self, history_dir: Path, index: dict, records: dict[str, dict]):
+        """Write a run file for the given records map and update the index.
+
+        Only the new run and the small index are written; runs beyond the
+        last 10 are deleted rather than rewritten.
+        """
+        now = datetime.now()
         run_data = {
-            "timestamp": datetime.now().isoformat(),
-            "records": {}
+            "timestamp": now.isoformat(),
+            "hash_algo": HASH_ALGO,
+            "records": records
         }
 
-        for record in results:
-            key = self._get_record_key(record, key_fields)
-            run_data["records"][key] = {
-                "data": record,
-                "hash": self._compute_record_hash(record)
-            }
-
-        # Keep last 10 runs
-        history["runs"] = history.get("runs", [])[-9:] + [run_data]
-        history["last_updated"] = datetime.now().isoformat()
+        history_dir.mkdir(parents=True, exist_ok=True)
+        run_file = f"run_{now.strftime('%Y%m%dT%H%M%S%f')}.json"
+        # Run files are only machine-read, so skip indentation - they are
+        # the bulk of what a save writes
+        self._write_json(history_dir / run_file, run_data, indent=False)
 
-        # Save
-        with open(history_path, 'w') as f:
-            json.dump(history, f, indent=2, default=str)
+        runs = index.get("runs", []) + [{
+            "file": run_file,
+            "timestamp": run_data["timestamp"],
+            "record_count": len(records)
+        }]
 
-    def _load_history(self, path: Path) -> dict:
-        """Load history from file."""
-        if path.exists():
+        # Keep last 10 runs
+        for old_run in runs[:-10]:
+            (history_dir / old_run["file"]).unlink(missing_ok=True)
+        index["runs"] = runs[-10:]
+        index["last_updated"] = datetime.now().isoformat()
+        self._write_json(history_dir / "index.json", index)
+
+    def _load_index(self, project_name: str, migrate_legacy: bool = False) -> dict:
+        """Load the run index for a project.
+
+        Nothing is written unless migrate_legacy is set, in which case an
+        old single-file history is split into run files first. Otherwise
+        legacy runs are kept in memory on the index entries.
+        """
+        history_dir = self._get_history_dir(project_name)
+        index_path = history_dir / "index.json"
+        if index_path.exists():
             try:
-                with open(path, 'r') as f:
-                    return json.load(f)
+                return self._read_json(index_path)
+            except Exception as e:
+                # Rebuild rather than start empty, which would orphan every
+                # run file on the next save
+                print(f"[Diff] Unreadable history index {index_path}: {e} - rebuilding from run files")
+                return self._scan_runs(history_dir)
+
+        legacy_path = self._get_legacy_history_path(project_name)
+        if legacy_path.exists():
+            return self._migrate_legacy_history(legacy_path, history_dir, write=migrate_legacy)
+        return self._scan_runs(history_dir)
+
+    def _scan_runs(self, history_dir: Path) -> dict:
+        """Rebuild a run index from the run files on disk, oldest first."""
+        runs = []
+        for run_path in sorted(history_dir.glob("run_*.json")):
+            try:
+                run = self._read_json(run_path)
+            except Exception as e:
+                print(f"[Diff] Skipping unreadable run file {run_path}: {e}")
+                continue
+            runs.append({
+                "file": run_path.name,
+                "timestamp": run.get("timestamp"),
+                "record_count": len(run.get("records", {}))
+            })
+        return {"runs": runs[-10:]}
+
+    def _migrate_legacy_history(self, legacy_path: Path, history_dir: Path, write: bool = True) -> dict:
+        """Split an old single-file history into per-run files plus an index.
+
+        With write=False nothing is changed on disk; each index entry
+        carries its run under "run" instead.
+        """
+        try:
+            history = self._read_json(legacy_path)
+        except Exception:
+            return {"runs": []}
+
+        index = {"runs": []}
+        for run in history.get("runs", [])[-10:]:
+            run = self._migrate_run(run)
+            # Legacy runs have no file name; derive one from their timestamp
+            stamp = "".join(c for c in str(run.get("timestamp", "")) if c.isalnum())
+            run_file = f"run_{stamp or len(index['runs'])}.json"
+            entry = {
+                "file": run_file,
+                "timestamp": run.get("timestamp"),
+                "record_count": len(run.get("records", {}))
+            }
+            if write:
+                history_dir.mkdir(parents=True, exist_ok=True)
+                self._write_json(history_dir / run_file, run, indent=False)
+            else:
+                entry["run"] = run
+            index["runs"].append(entry)
+
+        index["last_updated"] = history.get("last_updated", datetime.now().isoformat())
+        if write:
+            history_dir.mkdir(parents=True, exist_ok=True)
+            self._write_json(history_dir / "index.json", index)
+            legacy_path.unlink()
+        return index
+
+    def _load_last_run(self, history_dir: Path, index: dict) -> dict[str, dict]:
+        """Load the records map of the most recent run - the only one compare needs.
+
+        Runs hashed with another algorithm are rehashed in memory only; the
+        next save writes a run in the current format.
+        """
+        runs = index.get("runs", [])
+        if not runs:
+            return {}
+
+        run = runs[-1].get("run")  # Legacy run not yet split out
+        if run is None:
+            try:
+                run = self._read_json(history_dir / runs[-1]["file"])
             except Exception:
-                pass
-        return {"runs": []}
+                return {}
+
+        return self._migrate_run(run).get("records", {})
+
+    def _migrate_run(self, run: dict) -> dict:
+        """Rehash a run's records if they were saved with a different hash algorithm."""
+        if run.get("hash_algo") == HASH_ALGO:
+            return run
+
+        records = {}
+        for key, record in run.get("records", {}).items():
+            new_hash = self._compute_record_hash(record["data"])
+            # Records saved without key fields are keyed by their own hash
+            if key == record.get("hash"):
+                key = new_hash
+            records[key] = {"data": record["data"], "hash": new_hash}
+
+        run["records"] = records
+        run["hash_algo"] = HASH_ALGO
+        return run
 
     def compare(
         self,
@@ -119,76 +352,70 @@ class DiffDetector:
         key_fields: list[str] = None
     ) -> DiffSummary:
         """Compare current results with previous run."""
-        history_path = self._get_history_path(project_name)
-        history = self._load_history(history_path)
-
-        # Get previous run
-        runs = history.get("runs", [])
-        previous_records = {}
-        if runs:
-            last_run = runs[-1]
-            previous_records = last_run.get("records", {})
-
-        # Build current records map
-        current_records = {}
-        for record in current_results:
-            key = self._get_record_key(record, key_fields)
-            current_records[key] = {
-                "data": record,
-                "hash": self._compute_record_hash(record)
-            }
+        history_dir = self._get_history_dir(project_name)
+        index = self._load_index(project_name)
+        current_records = self._build_records_map(current_results, key_fields)
+        return self._diff(current_records, self._load_last_run(history_dir, index))
 
-        # Compare
-        diff_results = []
-        new_count = 0
-        changed_count = 0
-        unchanged_count = 0
+    def compare_and_save(
+        self,
+        project_name: str,
+        current_results: list[dict],
+        key_fields: list[str] = None
+    ) -> DiffSummary:
+        """Compare current results with the previous run, then save them.
+
+        Equivalent to compare() followed by save_results(), but each record
+        is hashed once and the history index is only read once.
+        """
+        history_dir = self._get_history_dir(project_name)
+        index = self._load_index(project_name, migrate_legacy=True)
+        current_records = self._build_records_map(current_results, key_fields)
+        summary = self._diff(current_records, self._load_last_run(history_dir, index))
+        self._write_run(history_dir, index, current_records)
+        return summary
+
+    def _diff(
+        self,
+        current_records: dict[str, dict],
+        previous_records: dict[str, dict]
+    ) -> DiffSummary:
+        """Diff two records maps as built by _build_records_map.
 
-        # Check current records
+        Results follow the current records' order, then removed records in
+        their previous order.
+        """
+        diff_results = []
+        new_count = changed_count = unchanged_count = 0
         for key, current in current_records.items():
-            if key not in previous_records:
-                # New record
+            previous = previous_records.get(key)
+            if previous is None:
+                diff_results.append(DiffResult(key=key, status=DiffStatus.NEW, current_data=current["data"]))
+                new_count += 1
+            elif current["hash"] == previous["hash"]:
                 diff_results.append(DiffResult(
                     key=key,
-                    status=DiffStatus.NEW,
+                    status=DiffStatus.UNCHANGED,
                     current_data=current["data"]
                 ))
-                new_count += 1
+                unchanged_count += 1
             else:
-                previous = previous_records[key]
-                if current["hash"] != previous["hash"]:
-                    # Changed record
-                    changed_fields = self._find_changed_fields(
-                        previous["data"],
-                        current["data"]
-                    )
-                    diff_results.append(DiffResult(
-                        key=key,
-                        status=DiffStatus.CHANGED,
-                        current_data=current["data"],
-                        previous_data=previous["data"],
-                        changed_fields=changed_fields
-                    ))
-                    changed_count += 1
-                else:
-                    # Unchanged
-                    diff_results.append(DiffResult(
-                        key=key,
-                        status=DiffStatus.UNCHANGED,
-                        current_data=current["data"]
-                    ))
-                    unchanged_count += 1
-
-        # Check for removed records
-        removed_count = 0
-        for key, previous in previous_records.items():
-            if key not in current_records:
                 diff_results.append(DiffResult(
                     key=key,
-                    status=DiffStatus.REMOVED,
-                    previous_data=previous["data"]
+                    status=DiffStatus.CHANGED,
+                    current_data=current["data"],
+                    previous_data=previous["data"],
+                    changed_fields=self._find_changed_fields(previous["data"], current["data"])
                 ))
-                removed_count += 1
+                changed_count += 1
+
+        removed = [
+            DiffResult(key=key, status=DiffStatus.REMOVED, previous_data=previous["data"])
+            for key, previous in previous_records.items()
+            if key not in current_records
+        ]
+
+        diff_results.extend(removed)
 
         return DiffSummary(
             timestamp=datetime.now(),
@@ -196,13 +423,22 @@ class DiffDetector:
             total_previous=len(previous_records),
             new_count=new_count,
             changed_count=changed_count,
-            removed_count=removed_count,
+            removed_count=len(removed),
             unchanged_count=unchanged_count,
             results=diff_results
         )
 
     def _find_changed_fields(self, old: dict, new: dict) -> list[str]:
         """Find which fields changed between two records."""
+        try:
+            # Symmetric difference of the item views is done in C; the .get()
+            # re-check keeps a missing key and an explicit None equal, as below
+            differing = {key for key, _ in old.items() ^ new.items()}
+            return [key for key in differing if old.get(key) != new.get(key)]
+        except TypeError:
+            # Unhashable values (lists, dicts) - compare field by field
+            pass
+
         changed = []
         all_keys = set(old.keys()) | set(new.keys())
 
@@ -217,20 +453,20 @@ class DiffDetector:
 
     def get_history(self, project_name: str) -> list[dict]:
         """Get run history for a project."""
-        history_path = self._get_history_path(project_name)
-        history = self._load_history(history_path)
-
-        runs = []
-        for run in history.get("runs", []):
-            runs.append({
+        index = self._load_index(project_name)
+        return [
+            {
                 "timestamp": run.get("timestamp"),
-                "record_count": len(run.get("records", {}))
-            })
-
-        return runs
+                "record_count": run.get("record_count", 0)
+            }
+            for run in index.get("runs", [])
+        ]
 
     def clear_history(self, project_name: str):
         """Clear history for a project."""
-        history_path = self._get_history_path(project_name)
-        if history_path.exists():
-            history_path.unlink()
+        history_dir = self._get_history_dir(project_name)
+        if history_dir.exists():
+            shutil.rmtree(history_dir)
+        legacy_path = self._get_legacy_history_path(project_name)
+        if legacy_path.exists():
+            legacy_path.unlink()
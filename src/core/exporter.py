@@ -2,12 +2,85 @@
 
 import csv
 import json
+import operator
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from dataclasses import dataclass
 
+from src.core._ident import sanitize
+from src.core._serialize import ORJSON_OPTIONS, json_default
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _sanitize_identifier(name: str) -> str:
+    """Sanitize a SQL identifier (table/column name) to prevent injection."""
+    # Only allow alphanumeric and underscore
+    return sanitize(name)
+
+
+def _row_getter(fields: list[str]) -> Callable[[dict], tuple]:
+    """Build a callable that returns a record's values for fields as a tuple.
+
+    Uses a C-level operator.itemgetter when every field is present and
+    falls back to dict.get (None for missing fields) otherwise.
+    """
+    if not fields:
+        return lambda record: ()
+    if len(fields) == 1:
+        key = fields[0]
+        getter = lambda record: (record[key],)
+    else:
+        getter = operator.itemgetter(*fields)
+
+    def row(record: dict) -> tuple:
+        try:
+            return getter(record)
+        except KeyError:
+            return tuple(record.get(f) for f in fields)
+
+    return row
+
+
+def _infer_types(record: dict) -> dict[str, str]:
+    """Infer SQLite types from a sample record."""
+    types = {}
+    for key, value in record.items():
+        if value is None:
+            types[key] = "TEXT"
+        elif isinstance(value, bool):
+            types[key] = "INTEGER"
+        elif isinstance(value, int):
+            types[key] = "INTEGER"
+        elif isinstance(value, float):
+            types[key] = "REAL"
+        else:
+            types[key] = "TEXT"
+    return types
+
+
+@dataclass
+class Schema:
+    """Field list and inferred column types, derived once from the first record.
+
+    Pass the same Schema to several exporters to avoid re-deriving it per format.
+    """
+    fields: list[str]
+    types: dict[str, str]
+
+    @classmethod
+    def from_data(cls, data: list[dict]) -> "Schema":
+        """Build a schema from the first record of data."""
+        if not data:
+            return cls(fields=[], types={})
+        return cls(fields=list(data[0].keys()), types=_infer_types(data[0]))
+
 
 @dataclass
 class ExportResult:
@@ -21,7 +94,13 @@ class ExportResult:
 class CSVExporter:
     """Export data to CSV format."""
 
-    def export(self, data: list[dict], path: str, fields: list[str] = None) -> ExportResult:
+    def export(
+        self,
+        data: list[dict],
+        path: str,
+        fields: list[str] = None,
+        schema: Optional[Schema] = None
+    ) -> ExportResult:
         """Export data to CSV file."""
         try:
             if not data:
@@ -29,12 +108,16 @@ class CSVExporter:
 
             # Determine fields
             if fields is None:
-                fields = list(data[0].keys())
+                fields = schema.fields if schema else list(data[0].keys())
 
-            with open(path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
-                writer.writeheader()
-                writer.writerows(data)
+            # Plain csv.writer over pre-extracted tuples skips DictWriter's
+            # per-row dict work; extra keys are ignored and missing ones
+            # (None) are written as empty cells, as before
+            row = _row_getter(fields)
+            with open(path, 'w', newline='', encoding='utf-8', buffering=8 * 1024 * 1024) as f:
+                writer = csv.writer(f)
+                writer.writerow(fields)
+                writer.writerows(row(record) for record in data)
 
             return ExportResult(True, path, len(data))
 
@@ -50,47 +133,83 @@ class JSONExporter:
         data: list[dict],
         path: str,
         indent: int = 2,
-        include_metadata: bool = True
+        include_metadata: bool = True,
+        schema: Optional[Schema] = None
     ) -> ExportResult:
         """Export data to JSON file."""
         try:
             if not data:
                 return ExportResult(False, path, 0, "No data to export")
 
-            output = data
+            metadata = None
             if include_metadata:
-                output = {
-                    "metadata": {
-                        "exported_at": datetime.now().isoformat(),
-                        "record_count": len(data),
-                        "fields": list(data[0].keys()) if data else []
-                    },
-                    "data": data
+                metadata = {
+                    "exported_at": datetime.now().isoformat(),
+                    "record_count": len(data),
+                    "fields": schema.fields if schema else list(data[0].keys())
                 }
 
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(output, f, indent=indent, ensure_ascii=False, default=str)
+            if not indent:
+                # Compact output can be streamed record by record, so the
+                # whole document is never held in memory as one payload
+                self._write_streaming(data, path, metadata)
+                return ExportResult(True, path, len(data))
+
+            output = data
+            if metadata is not None:
+                output = {"metadata": metadata, "data": data}
+
+            if HAS_ORJSON:
+                # orjson only supports 2-space indentation
+                payload = orjson.dumps(output, option=orjson.OPT_INDENT_2 | ORJSON_OPTIONS, default=json_default)
+            else:
+                payload = json.dumps(output, indent=indent, ensure_ascii=False, default=json_default).encode('utf-8')
+
+            # Write encoded bytes directly, skipping the text-mode codec layer
+            with open(path, 'wb', buffering=4 * 1024 * 1024) as f:
+                f.write(payload)
+                f.write(b"\n")
 
             return ExportResult(True, path, len(data))
 
         except Exception as e:
             return ExportResult(False, path, 0, str(e))
 
+    def _write_streaming(self, data: list[dict], path: str, metadata: Optional[dict]):
+        """Write compact JSON one record at a time through a large buffer."""
+        if HAS_ORJSON:
+            def dumps(obj: Any) -> bytes:
+                return orjson.dumps(obj, option=ORJSON_OPTIONS, default=json_default)
+        else:
+            def dumps(obj: Any) -> bytes:
+                return json.dumps(
+                    obj, separators=(",", ":"), ensure_ascii=False, default=json_default
+                ).encode('utf-8')
+
+        with open(path, 'wb', buffering=4 * 1024 * 1024) as f:
+            if metadata is not None:
+                f.write(b'{"metadata":' + dumps(metadata) + b',"data":[')
+            else:
+                f.write(b'[')
+
+            for i, record in enumerate(data):
+                if i:
+                    f.write(b',')
+                f.write(dumps(record))
+
+            f.write(b']}\n' if metadata is not None else b']\n')
+
 
 class SQLiteExporter:
     """Export data to SQLite database."""
 
-    def _sanitize_identifier(self, name: str) -> str:
-        """Sanitize a SQL identifier (table/column name) to prevent injection."""
-        # Only allow alphanumeric and underscore
-        return "".join(c if c.isalnum() or c == "_" else "_" for c in name)
-
     def export(
         self,
         data: list[dict],
         path: str,
         table_name: str = "scraped_data",
-        if_exists: str = "replace"  # replace, append, fail
+        if_exists: str = "replace",  # replace, append, fail
+        schema: Optional[Schema] = None
     ) -> ExportResult:
         """Export data to SQLite database."""
         try:
@@ -98,82 +217,90 @@ class SQLiteExporter:
                 return ExportResult(False, path, 0, "No data to export")
 
             # Sanitize table name to prevent SQL injection
-            table_name = self._sanitize_identifier(table_name)
+            table_name = _sanitize_identifier(table_name)
 
             # Determine schema from data
-            fields = list(data[0].keys())
-            field_types = self._infer_types(data[0])
+            if schema is None:
+                schema = Schema.from_data(data)
+            fields = schema.fields
+            field_types = schema.types
+            sanitized_fields = [_sanitize_identifier(f) for f in fields]
 
+            new_file = not Path(path).exists() or Path(path).stat().st_size == 0
             conn = sqlite3.connect(path)
-            cursor = conn.cursor()
-
-            # Handle existing table
-            if if_exists == "replace":
-                cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
-            elif if_exists == "fail":
+            try:
+                cursor = conn.cursor()
+
+                cursor.execute("PRAGMA cache_size=-65536")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                if new_file:
+                    # Bulk-load tuning for a file created by this export,
+                    # where a crash only loses this export. Any existing
+                    # database, even in replace mode, keeps the default
+                    # journal and fsync: rewriting sqlite_master and shared
+                    # pages without them can corrupt the other tables.
+                    # page_size only takes effect on an empty file. The
+                    # journal stays in memory rather than WAL, which would
+                    # persist in the file.
+                    cursor.execute("PRAGMA page_size=32768")
+                    cursor.execute("PRAGMA mmap_size=268435456")
+                    cursor.execute("PRAGMA journal_mode=MEMORY")
+                    cursor.execute("PRAGMA synchronous=OFF")
+
+                # Single explicit transaction for the whole export
+                cursor.execute("BEGIN IMMEDIATE")
+
+                # Handle existing table
+                if if_exists == "replace":
+                    cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+                elif if_exists == "fail":
+                    cursor.execute(
+                        "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                        (table_name,)
+                    )
+                    if cursor.fetchone():
+                        return ExportResult(False, path, 0, f"Table {table_name} already exists")
+
+                # Create table
+                if if_exists != "append":
+                    columns = ", ".join(
+                        f'"{col}" {field_types.get(f, "TEXT")}' for f, col in zip(fields, sanitized_fields)
+                    )
+                    cursor.execute(f'CREATE TABLE IF NOT EXISTS "{table_name}" ({columns})')
+
+                # Insert data
+                placeholders = ", ".join("?" for _ in fields)
+                column_names = ", ".join(f'"{col}"' for col in sanitized_fields)
+                insert_sql = f'INSERT INTO "{table_name}" ({column_names}) VALUES ({placeholders})'
+
+                row = _row_getter(fields)
+                cursor.executemany(insert_sql, (row(record) for record in data))
+
+                # Add metadata table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS _parsonic_metadata (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                """)
                 cursor.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-                    (table_name,)
-                )
-                if cursor.fetchone():
-                    return ExportResult(False, path, 0, f"Table {table_name} already exists")
-
-            # Create table
-            if if_exists != "append":
-                columns = ", ".join(
-                    f'"{self._sanitize_identifier(f)}" {field_types.get(f, "TEXT")}' for f in fields
+                    "INSERT OR REPLACE INTO _parsonic_metadata VALUES (?, ?)",
+                    ("last_export", datetime.now().isoformat())
                 )
-                cursor.execute(f'CREATE TABLE IF NOT EXISTS "{table_name}" ({columns})')
-
-            # Insert data
-            placeholders = ", ".join("?" for _ in fields)
-            column_names = ", ".join(f'"{self._sanitize_identifier(f)}"' for f in fields)
-            insert_sql = f'INSERT INTO "{table_name}" ({column_names}) VALUES ({placeholders})'
-
-            for record in data:
-                values = [record.get(f) for f in fields]
-                cursor.execute(insert_sql, values)
-
-            # Add metadata table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS _parsonic_metadata (
-                    key TEXT PRIMARY KEY,
-                    value TEXT
+                cursor.execute(
+                    "INSERT OR REPLACE INTO _parsonic_metadata VALUES (?, ?)",
+                    ("record_count", str(len(data)))
                 )
-            """)
-            cursor.execute(
-                "INSERT OR REPLACE INTO _parsonic_metadata VALUES (?, ?)",
-                ("last_export", datetime.now().isoformat())
-            )
-            cursor.execute(
-                "INSERT OR REPLACE INTO _parsonic_metadata VALUES (?, ?)",
-                ("record_count", str(len(data)))
-            )
-
-            conn.commit()
-            conn.close()
+
+                conn.commit()
+            finally:
+                conn.close()
 
             return ExportResult(True, path, len(data))
 
         except Exception as e:
             return ExportResult(False, path, 0, str(e))
 
-    def _infer_types(self, record: dict) -> dict[str, str]:
-        """Infer SQLite types from a sample record."""
-        types = {}
-        for key, value in record.items():
-            if value is None:
-                types[key] = "TEXT"
-            elif isinstance(value, bool):
-                types[key] = "INTEGER"
-            elif isinstance(value, int):
-                types[key] = "INTEGER"
-            elif isinstance(value, float):
-                types[key] = "REAL"
-            else:
-                types[key] = "TEXT"
-        return types
-
 
 class ExporterFactory:
     """Factory for creating exporters."""
@@ -206,3 +333,15 @@ class ExporterFactory:
 
         exporter = ExporterFactory.create(format)
         return exporter.export(data, path, **kwargs)
+
+    @staticmethod
+    def export_many(data: list[dict], paths: list[str], **kwargs) -> list[ExportResult]:
+        """Export the same data to several files, auto-detecting each format.
+
+        The schema is derived once and shared by every exporter.
+        """
+        schema = kwargs.pop("schema", None) or Schema.from_data(data)
+        return [
+            ExporterFactory.export(data, path, schema=schema, **kwargs)
+            for path in paths
+        ]
@@ -1,14 +1,38 @@
 """Smart field detection for business data scraping."""
 
+import heapq
 import re
-from typing import Optional
-
-
-# Common patterns for business data fields
-FIELD_PATTERNS = {
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+
+# Link selectors shared by FIELD_PATTERNS, SMART_SELECTORS and the presets
+_SEL_MAILTO = 'a[href^="mailto:"]'
+_SEL_TEL = 'a[href^="tel:"]'
+_SEL_LINKEDIN = 'a[href*="linkedin.com"]'
+_SEL_TWITTER = 'a[href*="twitter.com"]'
+_SEL_X = 'a[href*="x.com"]'
+_SEL_FACEBOOK = 'a[href*="facebook.com"]'
+
+
+# Common patterns for business data fields. content_patterns are written in
+# lowercase: they are matched case-sensitively against the lowercased text.
+FIELD_PATTERNS: dict[str, dict[str, Any]] = {
     # Contact patterns (highest priority for business scraping)
     "email": {
-        "selectors": ['a[href^="mailto:"]', '[data-email]', '.email', '.contact-email'],
+        "selectors": [_SEL_MAILTO, '[data-email]', '.email', '.contact-email'],
         "content_patterns": [r'\b[\w.-]+@[\w.-]+\.\w{2,}\b'],
         "attribute": "href",
         "transform": "regex_extract",
@@ -16,7 +40,7 @@ FIELD_PATTERNS = {
         "priority": 100,
     },
     "phone": {
-        "selectors": ['a[href^="tel:"]', '[data-phone]', '.phone', '.telephone'],
+        "selectors": [_SEL_TEL, '[data-phone]', '.phone', '.telephone'],
         "content_patterns": [r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'],
         "attribute": "href",
         "transform": "regex_replace",
@@ -32,17 +56,17 @@ FIELD_PATTERNS = {
 
     # Social media links
     "linkedin_url": {
-        "selectors": ['a[href*="linkedin.com"]'],
+        "selectors": [_SEL_LINKEDIN],
         "attribute": "href",
         "priority": 70,
     },
     "twitter_url": {
-        "selectors": ['a[href*="twitter.com"]', 'a[href*="x.com"]'],
+        "selectors": [_SEL_TWITTER, _SEL_X],
         "attribute": "href",
         "priority": 70,
     },
     "facebook_url": {
-        "selectors": ['a[href*="facebook.com"]'],
+        "selectors": [_SEL_FACEBOOK],
         "attribute": "href",
         "priority": 70,
     },
@@ -70,12 +94,12 @@ FIELD_PATTERNS = {
     },
     "revenue": {
         "selectors": ['.revenue', '[data-revenue]', '.annual-revenue'],
-        "content_patterns": [r'\$[\d,]+[MBK]?', r'Revenue:\s*\$'],
+        "content_patterns": [r'\$[\d,]+[mbk]?', r'revenue:\s*\$'],
         "priority": 40,
     },
     "founded": {
         "selectors": ['.founded', '[data-founded]', '.year-founded', '.established'],
-        "content_patterns": [r'Founded:?\s*\d{4}', r'Est\.?\s*\d{4}'],
+        "content_patterns": [r'founded:?\s*\d{4}', r'est\.?\s*\d{4}'],
         "priority": 40,
     },
 
@@ -88,10 +112,13 @@ FIELD_PATTERNS = {
         ],
         "context_hints": ["address", "location", "headquarters", "office", "hq", "located"],
         "content_patterns": [
-            r'^\d+\s+[\w\s]+(ST|AVE|BLVD|RD|DR|LN|CT|WAY|PL|STREET|AVENUE|ROAD|DRIVE|LANE|HIGHWAY|HWY)\b',  # Street address
-            r'\d+\s+\w+.*,\s*[A-Z]{2},?\s*\d{5}',  # Full address with city, state, zip
-            r',\s*[A-Z][a-z]+,\s*[A-Z]{2},?\s*\d{5}',  # City, State ZIP pattern
-            r'\d+\s+[A-Z][\w\s]+(?:Suite|Ste|Unit|Apt|#)\s*\d+',  # Address with suite/unit
+            # Written without adjacent overlapping quantifiers (\d+ before \d,
+            # \s+ before [\w\s]+, \w+ before .*) so failed matches on long text
+            # don't backtrack polynomially; the matched language is unchanged
+            r'^\d+\s[\w\s]+(?:st|ave|blvd|rd|dr|ln|ct|way|pl|street|avenue|road|drive|lane|highway|hwy)\b',  # Street address
+            r'\d\s+\w.*,\s*[a-z]{2},?\s*\d{5}',  # Full address with city, state, zip
+            r',\s*[a-z][a-z]+,\s*[a-z]{2},?\s*\d{5}',  # City, State ZIP pattern
+            r'\d\s+[a-z][\w\s]+(?:suite|ste|unit|apt|#)\s*\d',  # Address with suite/unit
         ],
         "priority": 85,  # Higher priority for business scraping
     },
@@ -135,30 +162,163 @@ FIELD_PATTERNS = {
 }
 
 
+def _combine_patterns(patterns: list[str]) -> Optional[re.Pattern[str]]:
+    """Fuse a field's content patterns into one alternation (None if it has none).
+
+    Only whether any pattern matches is used, so one search over the combined
+    regex is equivalent to searching each pattern in turn.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+# Below this length re's lower per-call overhead beats RE2's linear scan
+RE2_MIN_LENGTH = 64
+
+
+def _compile_ascii_variant(content_re: Optional[re.Pattern[str]]) -> Any:
+    """Compile content_re with RE2 for ASCII-only text, falling back to content_re.
+
+    RE2 runs in linear time, but its \\w, \\d and \\b are ASCII-only and its $
+    does not match before a trailing newline, so it is only used on ASCII text
+    and for patterns without a $ anchor.
+    """
+    if not HAS_RE2 or content_re is None or re.search(r'(?<!\\)\$', content_re.pattern):
+        return content_re
+    try:
+        return re2.compile(content_re.pattern)
+    except re2.error:
+        return content_re
+
+
+# (hint, is_data_attr, reason) and (hint, reason) entries of _FIELD_META
+_SelectorHint = tuple[str, bool, str]
+_ContextHint = tuple[str, str]
+# (field_name, selector_hints, context_hints, content_reason, priority_conf, attribute)
+_FieldMeta = tuple[str, tuple[_SelectorHint, ...], tuple[_ContextHint, ...], str, float, Optional[str]]
+
+
+def _build_field_meta(field_name: str, pattern_info: dict[str, Any]) -> _FieldMeta:
+    """Flatten the static parts of a FIELD_PATTERNS entry, reason strings included."""
+    # Class and data-attribute hints stay in one tuple in selector order, since
+    # the last matching selector supplies the reason
+    selector_hints: list[_SelectorHint] = []
+    for selector in pattern_info.get("selectors", []):
+        if selector.startswith("."):
+            hint = selector[1:].lower()
+            selector_hints.append((hint, False, f"class contains '{hint}'"))
+        elif selector.startswith("[data-"):
+            hint = selector[6:-1].lower()
+            selector_hints.append((hint, True, f"data attribute '{hint}'"))
+
+    context_hints = tuple(
+        (hint, f"context: '{hint}'")
+        for hint in (h.lower() for h in pattern_info.get("context_hints", []))
+    )
+    return (
+        field_name,
+        tuple(selector_hints),
+        context_hints,
+        f"content matches {field_name} pattern",
+        # Higher priority = higher confidence
+        0.5 + pattern_info.get("priority", 50) / 200,
+        pattern_info.get("attribute"),
+    )
+
+
+# Per-field lookups derived once at import, as flat tuples so the hot loop
+# unpacks them instead of doing dict lookups; FIELD_PATTERNS keeps the source data
+_FIELD_META: tuple[_FieldMeta, ...] = tuple(
+    _build_field_meta(field_name, pattern_info)
+    for field_name, pattern_info in FIELD_PATTERNS.items()
+)
+
+# Every content pattern needs a digit, '@', '$', '★' or "http" somewhere in the
+# text, so text without any of them (names, headings, labels) can skip the
+# per-field scan. Keep this in step when adding content patterns.
+_CONTENT_PREFILTER = re.compile(r'[\d@$★]|http')
+
+# (field_name, content_re, content_ascii_re) for fields with content patterns
+_CONTENT_SCANNERS: list[tuple[str, re.Pattern[str], Any]] = []
+for _field_name, _pattern_info in FIELD_PATTERNS.items():
+    _content_re = _combine_patterns(_pattern_info.get("content_patterns", []))
+    if _content_re is not None:
+        _CONTENT_SCANNERS.append((_field_name, _content_re, _compile_ascii_variant(_content_re)))
+
+
+# Every class/data/context hint word, matched in one pass per string
+_ALL_HINTS = frozenset(
+    [hint for _, selector_hints, *_ in _FIELD_META for hint, _, _ in selector_hints]
+    + [hint for _, _, context_hints, *_ in _FIELD_META for hint, _ in context_hints]
+)
+
+if HAS_AHOCORASICK:
+    _HINT_AUTOMATON = ahocorasick.Automaton()
+    for _hint in _ALL_HINTS:
+        _HINT_AUTOMATON.add_word(_hint, _hint)
+    _HINT_AUTOMATON.make_automaton()
+
+
+def _find_hints(haystack: str) -> frozenset[str]:
+    """Return the hint words occurring as substrings of haystack."""
+    if not haystack:
+        return frozenset()
+    if HAS_AHOCORASICK:
+        return frozenset(hint for _, hint in _HINT_AUTOMATON.iter(haystack))
+    return frozenset(hint for hint in _ALL_HINTS if hint in haystack)
+
+
+def _content_hits(text_lower: str) -> frozenset[str]:
+    """Return the fields whose content patterns match the lowercased text."""
+    if not text_lower or _CONTENT_PREFILTER.search(text_lower) is None:
+        return frozenset()
+    if len(text_lower) >= RE2_MIN_LENGTH and text_lower.isascii():
+        return frozenset(
+            field_name for field_name, _, ascii_re in _CONTENT_SCANNERS if ascii_re.search(text_lower)
+        )
+    return frozenset(
+        field_name for field_name, content_re, _ in _CONTENT_SCANNERS if content_re.search(text_lower)
+    )
+
+
+def _memoized(scan: Callable[[str], frozenset[str]]) -> Callable[[str], frozenset[str]]:
+    """Wrap a string scan with a dict cache, for reuse across one batch."""
+    cache: dict[str, frozenset[str]] = {}
+
+    def lookup(key: str) -> frozenset[str]:
+        hits = cache.get(key)
+        if hits is None:
+            hits = cache[key] = scan(key)
+        return hits
+
+    return lookup
+
+
 # Smart selectors for auto-detection
 SMART_SELECTORS = {
     "email": {
-        "primary": 'a[href^="mailto:"]',
+        "primary": _SEL_MAILTO,
         "fallbacks": ['[data-email]', '.email', '.contact-email'],
         "extract": "href",
     },
     "phone": {
-        "primary": 'a[href^="tel:"]',
+        "primary": _SEL_TEL,
         "fallbacks": ['[data-phone]', '.phone', '.telephone'],
         "extract": "href",
     },
     "linkedin_url": {
-        "primary": 'a[href*="linkedin.com"]',
+        "primary": _SEL_LINKEDIN,
         "fallbacks": ['[data-linkedin]', '.linkedin-link'],
         "extract": "href",
     },
     "twitter_url": {
-        "primary": 'a[href*="twitter.com"], a[href*="x.com"]',
+        "primary": f"{_SEL_TWITTER}, {_SEL_X}",
         "fallbacks": ['[data-twitter]', '.twitter-link'],
         "extract": "href",
     },
     "facebook_url": {
-        "primary": 'a[href*="facebook.com"]',
+        "primary": _SEL_FACEBOOK,
         "fallbacks": ['[data-facebook]', '.facebook-link'],
         "extract": "href",
     },
@@ -170,7 +330,54 @@ SMART_SELECTORS = {
 }
 
 
-def suggest_field_name(element_info: dict) -> list[dict]:
+# (name, confidence, reason) for href prefixes, checked before the social hosts
+_HREF_PREFIX_MAP = {
+    "mailto:": ("email", 0.98, "mailto: link detected"),
+    "tel:": ("phone", 0.98, "tel: link detected"),
+}
+
+# Social-media hosts in precedence order; the regex only tells whether any of
+# them occurs, the table decides which one wins
+_HREF_SOCIAL = (
+    ("linkedin.com", ("linkedin_url", 0.95, "LinkedIn URL")),
+    ("twitter.com", ("twitter_url", 0.95, "Twitter/X URL")),
+    ("x.com", ("twitter_url", 0.95, "Twitter/X URL")),
+    ("facebook.com", ("facebook_url", 0.95, "Facebook URL")),
+)
+_HREF_SOCIAL_RE = re.compile("|".join(re.escape(host) for host, _ in _HREF_SOCIAL))
+
+
+def _match_href(href: str) -> Optional[tuple[str, float, str]]:
+    """Return (name, confidence, reason) for a mailto:/tel:/social-media href."""
+    hit = _HREF_PREFIX_MAP.get(href[:7]) or _HREF_PREFIX_MAP.get(href[:4])
+    if hit is not None:
+        return hit
+    if _HREF_SOCIAL_RE.search(href) is None:
+        return None
+    for host, hit in _HREF_SOCIAL:
+        if host in href:
+            return hit
+    return None
+
+
+@dataclass(slots=True)
+class _Suggestion:
+    """A candidate field name; converted to a dict only if it is returned."""
+    name: str
+    confidence: float
+    attribute: Optional[str]
+    reason: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "confidence": self.confidence,
+            "attribute": self.attribute,
+            "reason": self.reason,
+        }
+
+
+def suggest_field_name(element_info: dict[str, Any]) -> list[dict[str, Any]]:
     """
     Analyze element and return ranked field name suggestions.
 
@@ -192,113 +399,97 @@ def suggest_field_name(element_info: dict) -> list[dict]:
             {"name": "contact_email", "confidence": 0.8, "reason": "class contains 'email'"},
         ]
     """
-    suggestions = []
+    return _suggest(element_info, _find_hints, _content_hits)
+
 
-    tag = element_info.get("tag", "").lower()
+def suggest_field_names_batch(elements: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """
+    Suggest field names for many elements at once.
+
+    Equivalent to calling suggest_field_name on each element, but the hint and
+    content scans are done once per distinct string, which pays off on pages
+    where sibling elements repeat the same classes or text.
+    """
+    find_hints = _memoized(_find_hints)
+    content_hits = _memoized(_content_hits)
+    return [_suggest(element_info, find_hints, content_hits) for element_info in elements]
+
+
+def _suggest(
+    element_info: dict[str, Any],
+    find_hints: Callable[[str], frozenset[str]],
+    content_hits: Callable[[str], frozenset[str]],
+) -> list[dict[str, Any]]:
+    """Rank field name suggestions using the given hint and content scanners."""
+    suggestions: list[_Suggestion] = []
+
+    tag: str = element_info.get("tag", "").lower()
+    href: str = element_info.get("href", "") or ""
+    text: str = element_info.get("text", "") or ""
+
+    # mailto:/tel: links and social-media URLs
+    href_hit = _match_href(href)
+    if href_hit is not None:
+        name, href_confidence, href_reason = href_hit
+        suggestions.append(_Suggestion(name, href_confidence, "href", href_reason))
+
+    # A mailto:/tel:/social link is already a near-certain answer that the
+    # class, context and content checks below could not outrank
+    if suggestions and suggestions[0].confidence >= 0.95:
+        return [s.to_dict() for s in suggestions[:5]]
+
+    # The address entry precedes zip in FIELD_PATTERNS, so a full address
+    # such as "12472 Memorial Dr, Houston, TX, 77024" is seen first and
+    # suppresses the zip match
+    address_detected = False
+
+    # Only needed past the href fast path above
     classes = element_info.get("classes", [])
-    classes_str = " ".join(classes).lower()
+    classes_str = " ".join(classes).lower() if classes else ""
     element_id = element_info.get("id", "").lower()
-    href = element_info.get("href", "") or ""
-    text = element_info.get("text", "") or ""
     parent_classes = element_info.get("parent_classes", [])
-    parent_classes_str = " ".join(parent_classes).lower()
-
-    # Check mailto: links first (highest confidence for email)
-    if href.startswith("mailto:"):
-        suggestions.append({
-            "name": "email",
-            "confidence": 0.98,
-            "attribute": "href",
-            "reason": "mailto: link detected"
-        })
-
-    # Check tel: links (highest confidence for phone)
-    elif href.startswith("tel:"):
-        suggestions.append({
-            "name": "phone",
-            "confidence": 0.98,
-            "attribute": "href",
-            "reason": "tel: link detected"
-        })
-
-    # Check social media links
-    elif "linkedin.com" in href:
-        suggestions.append({
-            "name": "linkedin_url",
-            "confidence": 0.95,
-            "attribute": "href",
-            "reason": "LinkedIn URL"
-        })
-    elif "twitter.com" in href or "x.com" in href:
-        suggestions.append({
-            "name": "twitter_url",
-            "confidence": 0.95,
-            "attribute": "href",
-            "reason": "Twitter/X URL"
-        })
-    elif "facebook.com" in href:
-        suggestions.append({
-            "name": "facebook_url",
-            "confidence": 0.95,
-            "attribute": "href",
-            "reason": "Facebook URL"
-        })
-
-    # Check for full address pattern FIRST (before checking other patterns)
-    # This ensures "12472 Memorial Dr, Houston, TX, 77024" is detected as address, not zip
-    address_patterns = [
-        (r'^\d+\s+[\w\s]+(ST|AVE|BLVD|RD|DR|LN|CT|WAY|PL|STREET|AVENUE|ROAD|DRIVE|LANE)\b', "starts with street number"),
-        (r'\d+\s+\w+.*,\s*[A-Z]{2}\s*\d{5}', "full address with city/state/zip"),
-        (r',\s*[A-Z][a-z]+,\s*[A-Z]{2}\s*\d{5}', "city, state ZIP pattern"),
-    ]
-    for pattern, reason in address_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            suggestions.append({
-                "name": "address",
-                "confidence": 0.92,
-                "attribute": None,
-                "reason": f"content matches address pattern ({reason})"
-            })
-            break  # Only add once
+    parent_classes_str = " ".join(parent_classes).lower() if parent_classes else ""
+
+    # Content patterns are lowercase, so fold case once here rather than
+    # having every search run with re.IGNORECASE
+    text_lower = text.lower()
+
+    # Scan each string for all hint words and the text for all content
+    # patterns once; the field loop below then only does set lookups
+    class_hits = find_hints(classes_str)
+    id_hits = find_hints(element_id)
+    parent_hits = find_hints(parent_classes_str)
+    matched_fields = content_hits(text_lower)
 
     # Check class names and IDs for hints
-    for field_name, pattern_info in FIELD_PATTERNS.items():
-        confidence = 0.0
-        reason = ""
-        attribute = pattern_info.get("attribute")
-
-        # Check class names
-        for selector in pattern_info.get("selectors", []):
-            # Extract class name from selector like '.email' or '[data-email]'
-            if selector.startswith("."):
-                class_hint = selector[1:].lower()
-                if class_hint in classes_str:
-                    confidence = max(confidence, 0.85)
-                    reason = f"class contains '{class_hint}'"
-            elif selector.startswith("[data-"):
-                # Data attribute hint
-                data_attr = selector[6:-1].lower()
-                if data_attr in classes_str or data_attr in element_id:
+    for field_name, selector_hints, context_hints, content_reason, priority_conf, field_attribute in _FIELD_META:
+        confidence: float = 0.0
+        reason: str = ""
+        attribute: Optional[str] = field_attribute
+
+        # Check class names and data attributes
+        for hint, is_data_attr, hint_reason in selector_hints:
+            if is_data_attr:
+                if hint in class_hits or hint in id_hits:
                     confidence = max(confidence, 0.80)
-                    reason = f"data attribute '{data_attr}'"
+                    reason = hint_reason
+            elif hint in class_hits:
+                confidence = max(confidence, 0.85)
+                reason = hint_reason
 
         # Check context hints in parent/nearby text
-        for hint in pattern_info.get("context_hints", []):
-            if hint in parent_classes_str or hint in element_id:
+        for hint, hint_reason in context_hints:
+            if hint in parent_hits or hint in id_hits:
                 confidence = max(confidence, 0.70)
-                reason = f"context: '{hint}'"
+                reason = hint_reason
 
         # Check content patterns (skip zip if we already detected address)
-        if field_name == "zip" and any(s["name"] == "address" for s in suggestions):
+        if field_name == "zip" and address_detected:
             continue  # Skip zip detection if address already detected
 
-        for pattern in pattern_info.get("content_patterns", []):
-            if re.search(pattern, text, re.IGNORECASE):
-                # Use priority to set confidence
-                priority = pattern_info.get("priority", 50)
-                conf = 0.5 + (priority / 200)  # Higher priority = higher confidence
-                confidence = max(confidence, conf)
-                reason = f"content matches {field_name} pattern"
+        if field_name in matched_fields:
+            confidence = max(confidence, priority_conf)
+            reason = content_reason
 
         # Check tag-based hints
         if tag == "h1" and field_name in ["company_name", "person_name"]:
@@ -313,60 +504,76 @@ def suggest_field_name(element_info: dict) -> list[dict]:
             attribute = "src"
 
         if confidence > 0.5:
-            suggestions.append({
-                "name": field_name,
-                "confidence": confidence,
-                "attribute": attribute,
-                "reason": reason
-            })
+            suggestions.append(_Suggestion(field_name, confidence, attribute, reason))
+            if field_name == "address":
+                address_detected = True
 
-    # Sort by confidence (highest first)
-    suggestions.sort(key=lambda x: x["confidence"], reverse=True)
+    # Top 5 by confidence (highest first, ties in insertion order, as a
+    # stable sort would give); only the returned ones become dicts
+    top = [s.to_dict() for s in heapq.nlargest(5, suggestions, key=lambda x: x.confidence)]
 
     # Add generic fallback if no good suggestions
-    if not suggestions or suggestions[0]["confidence"] < 0.6:
+    if not top or top[0]["confidence"] < 0.6:
         if tag == "a" and href:
-            suggestions.append({
+            top.append({
                 "name": "link",
                 "confidence": 0.4,
                 "attribute": "href",
                 "reason": "generic link"
             })
         elif tag == "img":
-            suggestions.append({
+            top.append({
                 "name": "image",
                 "confidence": 0.4,
                 "attribute": "src",
                 "reason": "image element"
             })
         elif tag in ["h1", "h2", "h3"]:
-            suggestions.append({
+            top.append({
                 "name": "title",
                 "confidence": 0.5,
                 "reason": f"heading ({tag})"
             })
         else:
-            suggestions.append({
+            top.append({
                 "name": "field",
                 "confidence": 0.3,
                 "reason": "generic field"
             })
 
-    return suggestions[:5]  # Return top 5 suggestions
-
+    return top[:5]  # Return top 5 suggestions
 
-def get_auto_detect_js() -> str:
-    """
-    Return JavaScript code for auto-detecting common fields on a page.
 
-    Returns JS that when executed returns an array of detected fields.
-    """
-    return """
+# Auto-detect script, built once; raw so JS regex escapes such as \b reach
+# the browser intact
+_AUTO_DETECT_JS = r"""
     (function() {
         var detected = [];
 
+        // Walk every link once and bucket it by href, instead of running a
+        // separate querySelectorAll per link type. A link can fall in more
+        // than one bucket, as it would match more than one selector.
+        var emails = [], phones = [], linkedin = [], twitter = [], facebook = [];
+        var contactLinks = [], websites = [];
+        var links = document.querySelectorAll('a[href]');
+        for (var n = 0; n < links.length; n++) {
+            var link = links[n];
+            var linkHref = link.getAttribute('href');
+            var isEmail = linkHref.startsWith('mailto:');
+            var isPhone = linkHref.startsWith('tel:');
+            if (isEmail) emails.push(link);
+            if (isPhone) phones.push(link);
+            if (isEmail || isPhone) contactLinks.push(link);
+            if (linkHref.indexOf('linkedin.com') !== -1) linkedin.push(link);
+            if (linkHref.indexOf('twitter.com') !== -1 || linkHref.indexOf('x.com') !== -1) twitter.push(link);
+            if (linkHref.indexOf('facebook.com') !== -1) facebook.push(link);
+            if (link.getAttribute('rel') === 'external' || link.classList.contains('website') ||
+                    link.classList.contains('external-link')) {
+                websites.push(link);
+            }
+        }
+
         // Email links
-        var emails = document.querySelectorAll('a[href^="mailto:"]');
         if (emails.length > 0) {
             detected.push({
                 name: 'email',
@@ -378,7 +585,6 @@ def get_auto_detect_js() -> str:
         }
 
         // Phone links
-        var phones = document.querySelectorAll('a[href^="tel:"]');
         if (phones.length > 0) {
             detected.push({
                 name: 'phone',
@@ -390,7 +596,6 @@ def get_auto_detect_js() -> str:
         }
 
         // LinkedIn links
-        var linkedin = document.querySelectorAll('a[href*="linkedin.com"]');
         if (linkedin.length > 0) {
             detected.push({
                 name: 'linkedin_url',
@@ -402,7 +607,6 @@ def get_auto_detect_js() -> str:
         }
 
         // Twitter/X links
-        var twitter = document.querySelectorAll('a[href*="twitter.com"], a[href*="x.com"]');
         if (twitter.length > 0) {
             detected.push({
                 name: 'twitter_url',
@@ -414,7 +618,6 @@ def get_auto_detect_js() -> str:
         }
 
         // Facebook links
-        var facebook = document.querySelectorAll('a[href*="facebook.com"]');
         if (facebook.length > 0) {
             detected.push({
                 name: 'facebook_url',
@@ -477,9 +680,8 @@ def get_auto_detect_js() -> str:
 
             // Last resort: look near phone/email elements
             if (!detected.some(function(d) { return d.name === 'address'; })) {
-                var phoneEmail = document.querySelectorAll('a[href^="tel:"], a[href^="mailto:"]');
-                for (var k = 0; k < phoneEmail.length; k++) {
-                    var parent = phoneEmail[k].parentElement;
+                for (var k = 0; k < contactLinks.length; k++) {
+                    var parent = contactLinks[k].parentElement;
                     if (parent) {
                         // Check siblings
                         var siblings = parent.children;
@@ -509,9 +711,8 @@ def get_auto_detect_js() -> str:
         }
 
         // External website links (excluding social media)
-        var websites = document.querySelectorAll('a[rel="external"], a.website, a.external-link');
         if (websites.length > 0) {
-            var validWebsites = Array.from(websites).filter(function(a) {
+            var validWebsites = websites.filter(function(a) {
                 var href = a.getAttribute('href') || '';
                 return href.startsWith('http') &&
                        !href.includes('linkedin.com') &&
@@ -532,14 +733,23 @@ def get_auto_detect_js() -> str:
 
         return detected;
     })();
+"""
+
+
+def get_auto_detect_js() -> str:
+    """
+    Return JavaScript code for auto-detecting common fields on a page.
+
+    Returns JS that when executed returns an array of detected fields.
     """
+    return _AUTO_DETECT_JS
 
 
 # Business field presets for quick setup
 BUSINESS_FIELD_PRESETS = {
     "contact_basic": [
-        {"name": "email", "selector": 'a[href^="mailto:"]', "attribute": "href"},
-        {"name": "phone", "selector": 'a[href^="tel:"]', "attribute": "href"},
+        {"name": "email", "selector": _SEL_MAILTO, "attribute": "href"},
+        {"name": "phone", "selector": _SEL_TEL, "attribute": "href"},
         {"name": "address", "selector": ".address, address, [data-address], .location, [itemprop='address'], .street-address"},
     ],
     "company_info": [
@@ -549,8 +759,8 @@ BUSINESS_FIELD_PRESETS = {
         {"name": "employees", "selector": ".employees, .company-size"},
     ],
     "social_links": [
-        {"name": "linkedin_url", "selector": 'a[href*="linkedin.com"]', "attribute": "href"},
-        {"name": "twitter_url", "selector": 'a[href*="twitter.com"]', "attribute": "href"},
-        {"name": "facebook_url", "selector": 'a[href*="facebook.com"]', "attribute": "href"},
+        {"name": "linkedin_url", "selector": _SEL_LINKEDIN, "attribute": "href"},
+        {"name": "twitter_url", "selector": _SEL_TWITTER, "attribute": "href"},
+        {"name": "facebook_url", "selector": _SEL_FACEBOOK, "attribute": "href"},
     ],
 }
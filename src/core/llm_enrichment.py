@@ -7,20 +7,79 @@ Uses local LLMs (via Ollama) for:
 3. Entity normalization (deduplicate and canonicalize company records)
 
 Respects thermal limits - pauses inference when system is hot.
+
+Generation requests from every helper and thread share one worker pool
+(LLMConfig.max_concurrency requests in flight). Ollama only serves them in
+parallel if started with enough slots, e.g. OLLAMA_NUM_PARALLEL=8, and
+OLLAMA_MAX_LOADED_MODELS=2 so the general and coder models can stay loaded
+side by side.
 """
 
+import asyncio
 import json
+import os
 import re
 import hashlib
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Tuple
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 from enum import Enum
+from html import escape
 
 # Thermal monitoring integration
 from src.core.thermal_monitor import is_thermal_safe, get_thermal_status, ThermalState
 
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+try:
+    import hnswlib
+    HAS_HNSWLIB = True
+except ImportError:
+    HAS_HNSWLIB = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as FastHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    try:
+        # selectolax < 1.0 only ships the Modest backend
+        from selectolax.parser import HTMLParser as FastHTMLParser
+        HAS_SELECTOLAX = True
+    except ImportError:
+        HAS_SELECTOLAX = False
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import json5
+    HAS_JSON5 = True
+except ImportError:
+    HAS_JSON5 = False
+
 
 class BusinessType(Enum):
     """Type of business."""
@@ -86,30 +145,846 @@ class DetectedField:
     attribute: Optional[str] = None  # None for text, "href" for links
 
 
+@dataclass
+class AdaptiveBatchSizer:
+    """Rows per batched prompt: grows after clean batches, halves after failures."""
+    initial: int = 8
+    min_size: int = 1
+    max_size: int = 32  # Batching gains plateau around 16-32 rows
+    step: int = 2
+
+    def __post_init__(self):
+        self._size = max(self.min_size, min(self.initial, self.max_size))
+
+    def current(self) -> int:
+        """Batch size to use for the next chunk."""
+        return self._size
+
+    def on_success(self):
+        """Record a batch that came back complete."""
+        self._size = min(self.max_size, self._size + self.step)
+
+    def on_failure(self):
+        """Record a timeout, server error, thermal stop, or mostly dropped batch."""
+        self._size = max(self.min_size, self._size // 2)
+
+
 @dataclass
 class LLMConfig:
     """Configuration for LLM enrichment."""
     # Ollama settings
     ollama_host: str = "http://localhost:11434"
 
-    # Model selection
-    classification_model: str = "qwen2.5:7b"
-    selector_model: str = "qwen2.5-coder:7b"
-    normalization_model: str = "qwen2.5:7b"
+    # Model selection. Classification and normalization only fill in small
+    # JSON objects, where a 3B Q4_K_M model keeps up with 7B at several times
+    # the throughput and half the VRAM; selector generation is the
+    # accuracy-critical task, so it keeps the 7B coder model. Each can be
+    # overridden with PARSONIC_<TASK>_MODEL; normalization follows the
+    # classification model unless set, so the two share one loaded model.
+    classification_model: str = field(default_factory=lambda: os.environ.get(
+        "PARSONIC_CLASSIFICATION_MODEL", "qwen2.5:3b-instruct-q4_K_M"))
+    selector_model: str = field(default_factory=lambda: os.environ.get(
+        "PARSONIC_SELECTOR_MODEL", "qwen2.5-coder:7b-instruct-q4_K_M"))
+    normalization_model: str = field(default_factory=lambda: os.environ.get(
+        "PARSONIC_NORMALIZATION_MODEL", ""))
 
     # Generation settings
     temperature: float = 0.3  # Low for deterministic output
-    max_tokens: int = 1024
+    max_tokens: int = 1024  # Budget for calls without a task
+    # Output budgets per task (per record for batched normalization); the
+    # JSON each task returns fits well within these
+    task_max_tokens: Dict[str, int] = field(default_factory=lambda: {
+        "classify": 384,
+        "normalize": 256,
+        "selectors": 768,
+        "analyze": 1024,
+    })
+    stop_sequences: List[str] = field(default_factory=lambda: ["```", "\n\n\n"])  # With a schema
     timeout: float = 30.0
+    num_ctx: int = 8192  # Ollama's default (2048) would truncate the page prompts
+    keep_alive: str = "30m"  # Keep models loaded between calls
+    prewarm: bool = False  # Load the models in the background on init
+
+    # Rows per batched normalization prompt, adapted between these bounds
+    initial_batch_size: int = 8
+    min_batch_size: int = 1
+    max_batch_size: int = 32
+
+    # Concurrent Ollama requests across all helpers and threads (match
+    # OLLAMA_NUM_PARALLEL)
+    max_concurrency: int = 4
 
-    # Caching
-    cache_dir: Optional[Path] = None
+    # Caching (responses are stored on disk; None disables the disk cache)
+    cache_dir: Optional[Path] = field(default_factory=lambda: Path.home() / ".parsonic" / "llm_cache")
     cache_ttl_hours: int = 24 * 7  # 1 week
 
+    # Semantic cache: reuse answers for near-duplicate classification and
+    # normalization prompts (needs hnswlib and the embedding model pulled).
+    # Off by default: records differing only in a phone number or address
+    # can clear the threshold and share one answer.
+    semantic_cache: bool = False
+    semantic_threshold: float = 0.93  # Cosine similarity required for a hit
+    embedding_model: str = "nomic-embed-text"
+
+    # Settle clear-cut pages with keyword rules when their confidence
+    # exceeds rule_confidence, skipping the model
+    rule_classification: bool = True
+    rule_confidence: float = 0.85
+
     # Thermal safety
     thermal_wait_seconds: float = 30.0  # Wait time when paused
     max_thermal_retries: int = 10
 
+    def __post_init__(self):
+        if not self.normalization_model:
+            self.normalization_model = self.classification_model
+
+
+# Elements dropped from HTML before it goes into a prompt
+_STRIP_TAGS = ('script', 'style', 'noscript', 'iframe', 'svg')
+
+# Scripts, styles and comments for the parser-less fallback, in one pass.
+# RE2 scans whole pages in linear time; the pattern works with either engine.
+_STRIP_HTML_PATTERN = r'(?is)<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<!--.*?-->'
+_STRIP_HTML_RE = re2.compile(_STRIP_HTML_PATTERN) if HAS_RE2 else re.compile(_STRIP_HTML_PATTERN)
+
+# JSON inside a markdown code fence, or the outermost {...} of a response
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+_JSON_OBJECT_RE = re.compile(r'\{[\s\S]*\}')
+
+# Rule-based pre-classification: explicit headcounts and storefront/service
+# phrases settle many pages without a model call
+_EMPLOYEE_RE = re.compile(
+    r'\b(\d{1,3}(?:,\d{3})+|\d{1,6})\+?\s*(?:full[- ]time\s+)?(?:employees|staff|team members)\b'
+    r'|\bteam of\s+(\d{1,3}(?:,\d{3})+|\d{1,6})\b',
+    re.IGNORECASE
+)
+_PRODUCT_RE = re.compile(
+    r'\b(?:buy now|add to cart|add to bag|shop now|sku|free shipping|in stock|checkout)\b',
+    re.IGNORECASE
+)
+_SERVICE_RE = re.compile(
+    r'\b(?:consulting|book a call|our services|free consultation|schedule a consultation'
+    r'|request a quote|get a quote|book an appointment)\b',
+    re.IGNORECASE
+)
+
+# Recently simplified pages, keyed by a digest of the raw HTML
+_SIMPLIFY_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_SIMPLIFY_CACHE_SIZE = 32
+
+# Seconds to skip the semantic cache after an embedding request fails
+_EMBED_RETRY_SECONDS = 300.0
+
+
+def _simplify_html(html: str) -> str:
+    """Remove scripts, styles, and comments, memoizing recent pages."""
+    key = hashlib.blake2b(html.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    simplified = _SIMPLIFY_CACHE.get(key)
+    if simplified is not None:
+        _SIMPLIFY_CACHE.move_to_end(key)
+        return simplified
+
+    simplified = _strip_html(html)
+    _SIMPLIFY_CACHE[key] = simplified
+    if len(_SIMPLIFY_CACHE) > _SIMPLIFY_CACHE_SIZE:
+        _SIMPLIFY_CACHE.popitem(last=False)
+    return simplified
+
+
+def _strip_html(html: str) -> str:
+    """Drop _STRIP_TAGS and comments with the fastest parser available."""
+    if HAS_SELECTOLAX:
+        tree = FastHTMLParser(html)
+        for node in tree.css(", ".join(_STRIP_TAGS)):
+            node.decompose()
+        comments = [
+            node for node in tree.root.traverse(include_text=False)
+            if node.tag in ("-comment", "_comment")
+        ] if tree.root is not None else []
+        for node in comments:
+            node.decompose()
+        return tree.html or ""
+
+    if HAS_LXML and html.strip():
+        doc = lxml.html.document_fromstring(html)
+        for element in list(doc.iter(*_STRIP_TAGS, etree.Comment)):
+            element.drop_tree()
+        return lxml.html.tostring(doc, encoding="unicode")
+
+    try:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Remove script and style elements
+        for tag in soup(list(_STRIP_TAGS)):
+            tag.decompose()
+
+        # Remove comments
+        from bs4 import Comment
+        for comment in soup.find_all(string=lambda t: isinstance(t, Comment)):
+            comment.extract()
+
+        # Get simplified HTML
+        return soup.prettify()
+
+    except ImportError:
+        # Fallback: basic regex cleanup
+        return _STRIP_HTML_RE.sub('', html)
+
+
+# DOM-aware trimming: elements likely to hold business fields are kept
+# (with their ancestors) when a page exceeds the prompt budget
+_TRIM_TAG_WEIGHTS = {
+    "h1": 6, "h2": 4, "h3": 3, "address": 5, "a": 2, "li": 1, "span": 1,
+    "p": 1, "div": 1, "td": 1, "dd": 1, "strong": 1, "b": 1, "section": 1,
+}
+_TRIM_HINT_RE = re.compile(
+    r'name|title|phone|tel|email|mail|address|street|city|zip|contact'
+    r'|rating|review|star|category|website|company|business|hours',
+    re.IGNORECASE
+)
+_TRIM_TEXT_RE = re.compile(r'@|\(?\d{3}\)?[-.\s]\d{3}[-.\s]\d{4}|\b\d{5}\b|★')
+
+
+def _trim_score(node, own_text: str) -> int:
+    """How likely an element itself is to hold a business field (0 = not at all).
+
+    Only the element's own text is scanned; containers are credited with
+    their children's scores in _trim_html.
+    """
+    attributes = node.attributes
+    hints = " ".join(filter(None, (
+        attributes.get("id"), attributes.get("class"), attributes.get("itemprop")
+    )))
+    href = attributes.get("href") or ""
+
+    score = _TRIM_TAG_WEIGHTS.get(node.tag, 0)
+    if attributes.get("id"):
+        score += 3
+    if any(name.startswith("data-") for name in attributes):
+        score += 2
+    if hints and _TRIM_HINT_RE.search(hints):
+        score += 4
+    if href.startswith(("tel:", "mailto:")):
+        score += 5
+    if own_text and _TRIM_TEXT_RE.search(own_text[:200]):
+        score += 3
+    return score
+
+
+def _open_tag(node) -> str:
+    """Opening tag keeping only the attributes selectors are built from."""
+    attrs = "".join(
+        f' {name}="{escape(value or "")}"'
+        for name, value in node.attributes.items()
+        if (name in ("id", "class") and value) or name.startswith("data-")
+    )
+    return f"<{node.tag}{attrs}>"
+
+
+def _trim_html(html: str, max_chars: int, marker: str = "<!-- truncated -->") -> str:
+    """
+    Fit simplified HTML into max_chars, keeping the elements most likely to
+    hold business fields instead of just the start of the document.
+
+    Each element is scored together with its descendants, so a whole record
+    (name, phone, address) outranks its individual fields. Chosen elements
+    are emitted in document order inside their ancestors' opening tags (id,
+    class and data-* only), each ancestor once, so selector paths stay
+    valid. Falls back to plain truncation without selectolax or when
+    nothing scores.
+    """
+    if len(html) <= max_chars:
+        return html
+
+    budget = max(0, max_chars - len(marker) - 1)
+    tree = FastHTMLParser(html) if HAS_SELECTOLAX else None
+    if tree is None or tree.body is None:
+        return html[:budget] + "\n" + marker
+
+    nodes = list(tree.body.traverse(include_text=False))
+    order = {node.mem_id: position for position, node in enumerate(nodes)}
+
+    # One bottom-up pass: subtree score and approximate HTML size per element
+    score: Dict[int, int] = {}
+    size: Dict[int, int] = {}
+    for node in reversed(nodes):
+        mem_id = node.mem_id
+        own_text = node.text(deep=False)
+        attributes = node.attributes
+        # Weak signals alone (a bare link, a plain div) add nothing, so a
+        # nav bar full of links can't outrank a record
+        own_score = _trim_score(node, own_text)
+        score[mem_id] = score.get(mem_id, 0) + (own_score if own_score >= 3 else 0)
+        size[mem_id] = size.get(mem_id, 0) + len(own_text) + 2 * len(node.tag) + 5 + sum(
+            len(name) + len(value or "") + 4 for name, value in attributes.items()
+        )
+        parent = node.parent
+        if parent is not None and parent.mem_id in order:
+            score[parent.mem_id] = score.get(parent.mem_id, 0) + score[mem_id]
+            size[parent.mem_id] = size.get(parent.mem_id, 0) + size[mem_id]
+
+    # Bounded-size candidates only; whole sections would eat the budget
+    node_cap = max_chars // 4
+    candidates = sorted(
+        ((score[node.mem_id], -order[node.mem_id], node) for node in nodes
+         if score[node.mem_id] >= 3 and size[node.mem_id] <= node_cap),
+        key=lambda item: item[:2],
+        reverse=True
+    )
+
+    fragments: Dict[int, str] = {}  # Chosen element -> its HTML
+    covered = set()  # Chosen elements and everything inside them
+    children: Dict[int, List[int]] = {}  # Kept ancestor -> kept children
+    wrappers: Dict[int, Any] = {}  # Kept ancestors by mem_id
+    for _, _, node in candidates:
+        if budget <= 0:
+            break
+        if node.mem_id in covered or node.mem_id in wrappers:
+            continue  # Inside a chosen element, or around one already
+
+        fragment = node.html or ""
+        ancestors = []
+        parent = node.parent
+        while parent is not None and parent.mem_id in order:
+            ancestors.append(parent)
+            parent = parent.parent
+        new_wrappers = [a for a in ancestors if a.mem_id not in wrappers]
+        cost = len(fragment) + sum(len(_open_tag(a)) + len(a.tag) + 3 for a in new_wrappers)
+        if len(fragment) > node_cap or cost > budget:
+            continue
+
+        budget -= cost
+        fragments[node.mem_id] = fragment
+        covered.update(n.mem_id for n in node.traverse(include_text=False))
+        child = node
+        for ancestor in ancestors:
+            siblings = children.setdefault(ancestor.mem_id, [])
+            if child.mem_id not in siblings:
+                siblings.append(child.mem_id)
+            wrappers[ancestor.mem_id] = ancestor
+            child = ancestor
+
+    if not fragments:
+        return html[:max(0, max_chars - len(marker) - 1)] + "\n" + marker
+
+    def render(mem_id: int) -> str:
+        if mem_id in fragments:
+            return fragments[mem_id]
+        node = wrappers[mem_id]
+        inner = "".join(render(c) for c in sorted(children[mem_id], key=order.get))
+        return f"{_open_tag(node)}{inner}</{node.tag}>"
+
+    return render(tree.body.mem_id) + "\n" + marker
+
+
+def _locate_evidence(evidence: List[Any], page_text: str) -> List[Dict[str, Any]]:
+    """
+    Fill in each evidence item's snippet from where its indicator occurs in
+    page_text, in one pass over the text. Items whose indicator is not on
+    the page are dropped.
+    """
+    items = [dict(item) for item in evidence if isinstance(item, dict)]
+    wanted: Dict[str, List[int]] = {}
+    for i, item in enumerate(items):
+        # Older cached responses quote a snippet instead of an indicator
+        indicator = str(item.get("indicator") or item.get("snippet") or "").strip().lower()
+        if indicator:
+            wanted.setdefault(indicator, []).append(i)
+    if not wanted:
+        return []
+
+    haystack = page_text.lower()
+    # Lowercasing can change length for a few characters; offsets must match
+    source = page_text if len(haystack) == len(page_text) else haystack
+    spans: Dict[int, Tuple[int, int]] = {}
+
+    if HAS_AHOCORASICK:
+        automaton = ahocorasick.Automaton()
+        for indicator, indices in wanted.items():
+            automaton.add_word(indicator, (len(indicator), indices))
+        automaton.make_automaton()
+        needed = sum(len(indices) for indices in wanted.values())
+        for end, (length, indices) in automaton.iter(haystack):
+            for i in indices:
+                spans.setdefault(i, (end - length + 1, end + 1))
+            if len(spans) == needed:
+                break
+    else:
+        for indicator, indices in wanted.items():
+            start = haystack.find(indicator)
+            if start != -1:
+                for i in indices:
+                    spans[i] = (start, start + len(indicator))
+
+    located = []
+    for i, item in enumerate(items):
+        if i in spans:
+            start, end = spans[i]
+            item["snippet"] = source[max(0, start - 40):end + 40].strip()
+            located.append(item)
+    return located
+
+
+def _entity_key(entity: Dict[str, Any]) -> bytes:
+    """Digest of an entity that ignores key order, case and padding."""
+    canonical = {k: v.strip().lower() if isinstance(v, str) else v for k, v in entity.items()}
+    if HAS_ORJSON:
+        data = orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        data = json.dumps(canonical, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def _is_complete_json(text: str) -> bool:
+    """True if text is one complete JSON object (checked when a brace closes)."""
+    text = text.strip()
+    if not (text.startswith("{") and text.endswith("}")):
+        return False
+    try:
+        orjson.loads(text) if HAS_ORJSON else json.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+class _SemanticCache:
+    """HNSW index of prompt embeddings mapping to cached responses.
+
+    One index per (model, system prompt), persisted as <name>.bin with the
+    responses alongside in <name>.json. Writes are batched; call save() to
+    persist the rest. Expired entries are dropped and their slots reused.
+    """
+
+    SAVE_EVERY = 32  # Additions between writes
+    SAVE_INTERVAL = 30.0  # Seconds; an addition after this long also writes
+    NEIGHBOURS = 4  # Candidates checked, so an expired neighbour can't mask a fresh one
+
+    def __init__(self, directory: Path, name: str, ttl_hours: int):
+        self._index_path = directory / f"{name}.bin"
+        self._entries_path = directory / f"{name}.json"
+        self._ttl_seconds = ttl_hours * 3600
+        self._index = None
+        # (response, ts) by label; None for a dropped entry whose label is free
+        self._entries: List[Optional[Tuple[str, float]]] = []
+        self._free: List[int] = []
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+
+        try:
+            stored = json.loads(self._entries_path.read_text(encoding="utf-8"))
+            index = hnswlib.Index(space="cosine", dim=stored["dim"])
+            index.load_index(
+                str(self._index_path),
+                max_elements=max(1024, len(stored["entries"])),
+                allow_replace_deleted=True
+            )
+        except (OSError, ValueError, KeyError, RuntimeError):
+            return
+        self._index = index
+        self._entries = [tuple(entry) if entry else None for entry in stored["entries"]]
+
+        # The two files are written separately, so after a crash the index
+        # may hold labels with no entry; those are dropped like expired ones
+        labels = index.get_ids_list()
+        if labels:
+            self._entries.extend([None] * (max(labels) + 1 - len(self._entries)))
+        now = time.time()
+        for label in labels:
+            entry = self._entries[label]
+            if entry is None or now - entry[1] > self._ttl_seconds:
+                self._drop(label)
+
+    def _drop(self, label: int):
+        """Remove an entry from the index and free its label for reuse."""
+        try:
+            self._index.mark_deleted(label)
+        except RuntimeError:
+            pass  # Already deleted
+        if label < len(self._entries):
+            self._entries[label] = None
+            self._free.append(label)
+        self._unsaved += 1
+
+    def lookup(self, vector: List[float], threshold: float) -> Optional[str]:
+        """Return the response for the nearest fresh stored prompt if similar enough."""
+        with self._lock:
+            if self._index is None or len(vector) != self._index.dim:
+                return None
+            live = self._index.get_current_count() - len(self._free)
+            if live <= 0:
+                return None
+
+            try:
+                labels, distances = self._index.knn_query([vector], k=min(self.NEIGHBOURS, live))
+            except RuntimeError:
+                return None
+
+            now = time.time()
+            for label, distance in zip(labels[0], distances[0]):
+                if 1.0 - float(distance) < threshold:
+                    break  # Neighbours come nearest first
+                label = int(label)
+                entry = self._entries[label] if label < len(self._entries) else None
+                if entry is None:
+                    continue
+                if now - entry[1] > self._ttl_seconds:
+                    self._drop(label)
+                    continue
+                return entry[0]
+            return None
+
+    def add(self, vector: List[float], response: str):
+        """Store a response under its prompt embedding."""
+        with self._lock:
+            if self._index is None:
+                self._index = hnswlib.Index(space="cosine", dim=len(vector))
+                self._index.init_index(max_elements=1024, allow_replace_deleted=True)
+            elif len(vector) != self._index.dim:
+                return
+
+            if self._free:
+                # Reuse the slot of a dropped entry
+                label = self._free.pop()
+                self._index.add_items([vector], [label], replace_deleted=True)
+                self._entries[label] = (response, time.time())
+            else:
+                if self._index.get_current_count() >= self._index.get_max_elements():
+                    self._index.resize_index(self._index.get_max_elements() * 2)
+                self._index.add_items([vector], [len(self._entries)])
+                self._entries.append((response, time.time()))
+
+            self._unsaved += 1
+            if self._unsaved >= self.SAVE_EVERY or time.monotonic() - self._last_save >= self.SAVE_INTERVAL:
+                self._save()
+
+    def save(self):
+        """Persist any unsaved changes."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def _save(self):
+        """Write the index and entries, each through a temp file and rename."""
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+        if self._index is None:
+            return
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_index = self._index_path.with_suffix(".bin.tmp")
+            self._index.save_index(str(tmp_index))
+            tmp_entries = self._entries_path.with_suffix(".json.tmp")
+            tmp_entries.write_text(
+                json.dumps({"dim": self._index.dim, "entries": self._entries}),
+                encoding="utf-8"
+            )
+            os.replace(tmp_index, self._index_path)
+            os.replace(tmp_entries, self._entries_path)
+        except OSError as e:
+            print(f"[LLM] Semantic cache write failed: {e}")
+
+
+class _ThermalAbort(Exception):
+    """A streamed generation was stopped because the system got too hot."""
+
+    def __init__(self, partial: str):
+        super().__init__("thermal limit reached mid-generation")
+        self.partial = partial
+
+
+class _OllamaDispatcher:
+    """Process-wide queue of Ollama requests served by a fixed worker pool.
+
+    The queue and workers live on an event loop in a daemon thread, so calls
+    from any thread or event loop share one pool of concurrency slots
+    (sized to OLLAMA_NUM_PARALLEL) and one pooled httpx.AsyncClient. Each
+    queued job is an async callable that receives the client.
+
+    Jobs are queued per model and workers stay on one model while it has
+    work, switching only once its requests have finished, so Ollama loads
+    each model once per run of calls instead of swapping between them.
+    """
+
+    # Jobs started on one model before yielding to others that are waiting
+    MAX_MODEL_RUN = 32
+
+    def __init__(self, host: str, concurrency: int):
+        self._host = host
+        self._concurrency = max(1, concurrency)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="ollama-dispatcher", daemon=True
+        )
+        self._thread.start()
+        self.run(self._start())
+
+    async def _start(self):
+        """Create the client, queues and workers on the dispatcher loop."""
+        import httpx
+
+        self._client = httpx.AsyncClient(
+            base_url=self._host,
+            limits=httpx.Limits(max_connections=self._concurrency),
+            transport=httpx.AsyncHTTPTransport(retries=2)
+        )
+        self._pending: Dict[str, deque] = {}
+        self._active_model: Optional[str] = None
+        self._in_flight = 0
+        self._run_length = 0
+        self._ready = asyncio.Condition()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self._concurrency)]
+
+    def _next_job(self):
+        """Pick the next (job, future), or None if workers should wait."""
+        waiting = [model for model, jobs in self._pending.items() if jobs]
+        if not waiting:
+            return None
+
+        others = [model for model in waiting if model != self._active_model]
+        if self._active_model in waiting and not (others and self._run_length >= self.MAX_MODEL_RUN):
+            self._run_length += 1
+            return self._pending[self._active_model].popleft()
+
+        # Let the active model's requests finish before loading another
+        if self._in_flight:
+            return None
+        candidates = others or waiting
+        self._active_model = max(candidates, key=lambda model: len(self._pending[model]))
+        self._run_length = 1
+        return self._pending[self._active_model].popleft()
+
+    async def _worker(self):
+        """Run queued jobs one at a time."""
+        while True:
+            async with self._ready:
+                item = self._next_job()
+                while item is None:
+                    await self._ready.wait()
+                    item = self._next_job()
+                self._in_flight += 1
+
+            job, future = item
+            try:
+                if not future.cancelled():
+                    result = await job(self._client)
+                    if not future.cancelled():
+                        future.set_result(result)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                async with self._ready:
+                    self._in_flight -= 1
+                    self._ready.notify_all()
+
+    async def _enqueue(self, job: Callable[[Any], Awaitable[Any]], model: str) -> Any:
+        """Queue a job for a model and wait for a worker to complete it."""
+        future = self._loop.create_future()
+        async with self._ready:
+            self._pending.setdefault(model, deque()).append((job, future))
+            self._ready.notify()
+        return await future
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the dispatcher loop and block for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def asubmit(self, job: Callable[[Any], Awaitable[Any]], model: str = "") -> Any:
+        """Queue a job from any event loop and await its result."""
+        if asyncio.get_running_loop() is self._loop:
+            return await self._enqueue(job, model)
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._enqueue(job, model), self._loop)
+        )
+
+
+_DISPATCHERS: Dict[Tuple[str, int], _OllamaDispatcher] = {}
+_DISPATCHERS_LOCK = threading.Lock()
+
+
+def _get_dispatcher(host: str, concurrency: int) -> _OllamaDispatcher:
+    """Shared dispatcher for an Ollama host, started on first use."""
+    with _DISPATCHERS_LOCK:
+        key = (host, concurrency)
+        if key not in _DISPATCHERS:
+            _DISPATCHERS[key] = _OllamaDispatcher(host, concurrency)
+        return _DISPATCHERS[key]
+
+
+_CLASSIFICATION_SYSTEM_PROMPT = """You are a business analyst. Analyze the provided webpage content and classify the business.
+
+Output valid JSON only with this exact structure:
+{
+    "business_type": "products" | "services" | "both" | "unknown",
+    "employee_bucket": "1-10" | "11-50" | "51-200" | "201-1000" | "1000+" | "unknown",
+    "confidence": 0.0-1.0,
+    "evidence": [
+        {"field": "business_type", "indicator": "short phrase from text", "weight": "strong|moderate|weak"},
+        {"field": "employee_bucket", "indicator": "short phrase from text", "weight": "strong|moderate|weak"}
+    ]
+}
+
+Rules:
+- business_type: "products" if they sell physical/digital products, "services" if they provide services, "both" if mixed
+- employee_bucket: Look for phrases like "team of X", "X employees", company size indicators
+- confidence: Your certainty (0.9+ needs strong evidence, 0.5-0.7 for reasonable inference)
+- evidence: For each decision, the few words (copied exactly from the text) that led to it"""
+
+_NORMALIZATION_SYSTEM_PROMPT = """You are a data normalization expert. Canonicalize the entity record.
+
+Output valid JSON only with this structure:
+{
+    "legal_name": "Full legal company name",
+    "brand_name": "Common brand/trade name",
+    "domain": "primary domain without www",
+    "hq_city": "Headquarters city",
+    "hq_state": "State/province code",
+    "hq_country": "Country code (US, UK, etc)",
+    "industry": "Primary industry category",
+    "is_b2b": true/false/null,
+    "confidence": 0.0-1.0
+}
+
+Rules:
+- legal_name: Official registered name (Inc, LLC, Corp, etc)
+- brand_name: What customers call it
+- domain: Extract from website/email, normalize (no www, https)
+- is_b2b: true if primarily B2B, false if B2C, null if unclear
+- Normalize all text: proper capitalization, consistent formatting"""
+
+
+_NORMALIZATION_BATCH_SYSTEM_PROMPT = """You are a data normalization expert. Canonicalize each entity record.
+
+Output valid JSON only with this structure, one result per input entity:
+{
+    "results": [
+        {
+            "index": 0,
+            "legal_name": "Full legal company name",
+            "brand_name": "Common brand/trade name",
+            "domain": "primary domain without www",
+            "hq_city": "Headquarters city",
+            "hq_state": "State/province code",
+            "hq_country": "Country code (US, UK, etc)",
+            "industry": "Primary industry category",
+            "is_b2b": true/false/null,
+            "confidence": 0.0-1.0
+        }
+    ]
+}
+
+Rules:
+- index: The index of the input entity this result belongs to
+- legal_name: Official registered name (Inc, LLC, Corp, etc)
+- brand_name: What customers call it
+- domain: Extract from website/email, normalize (no www, https)
+- is_b2b: true if primarily B2B, false if B2C, null if unclear
+- Normalize all text: proper capitalization, consistent formatting"""
+
+# JSON Schemas passed as Ollama's "format" so decoding can only produce
+# the shape each parser expects
+_CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "business_type": {"enum": ["products", "services", "both", "unknown"]},
+        "employee_bucket": {"enum": ["1-10", "11-50", "51-200", "201-1000", "1000+", "unknown"]},
+        "confidence": {"type": "number"},
+        "evidence": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "field": {"type": "string"},
+                    "indicator": {"type": "string", "maxLength": 60},
+                    "weight": {"enum": ["strong", "moderate", "weak"]},
+                },
+                "required": ["field", "indicator", "weight"],
+            },
+        },
+    },
+    "required": ["business_type", "employee_bucket", "confidence", "evidence"],
+}
+
+_NORMALIZED_ENTITY_PROPERTIES = {
+    "legal_name": {"type": "string"},
+    "brand_name": {"type": "string"},
+    "domain": {"type": "string"},
+    "hq_city": {"type": "string"},
+    "hq_state": {"type": "string"},
+    "hq_country": {"type": "string"},
+    "industry": {"type": "string"},
+    "is_b2b": {"type": ["boolean", "null"]},
+    "confidence": {"type": "number"},
+}
+
+_NORMALIZATION_SCHEMA = {
+    "type": "object",
+    "properties": _NORMALIZED_ENTITY_PROPERTIES,
+    "required": list(_NORMALIZED_ENTITY_PROPERTIES),
+}
+
+_NORMALIZATION_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"index": {"type": "integer"}, **_NORMALIZED_ENTITY_PROPERTIES},
+                "required": ["index", *_NORMALIZED_ENTITY_PROPERTIES],
+            },
+        },
+    },
+    "required": ["results"],
+}
+
+_SELECTORS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "selectors": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "field": {"type": "string"},
+                    "selector": {"type": "string"},
+                    "confidence": {"type": "number"},
+                    "fallbacks": {"type": "array", "items": {"type": "string"}},
+                    "reasoning": {"type": "string"},
+                },
+                "required": ["field", "selector", "confidence", "fallbacks"],
+            },
+        },
+    },
+    "required": ["selectors"],
+}
+
+_FIELDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "fields": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "selector": {"type": "string"},
+                    "sample_value": {"type": "string"},
+                    "confidence": {"type": "number"},
+                    "field_type": {"enum": ["text", "link", "email", "phone", "address"]},
+                    "attribute": {"type": ["string", "null"]},
+                },
+                "required": ["name", "selector", "confidence", "field_type"],
+            },
+        },
+    },
+    "required": ["fields"],
+}
+
 
 class LLMEnrichment:
     """
@@ -132,12 +1007,151 @@ class LLMEnrichment:
     def __init__(self, config: Optional[LLMConfig] = None):
         self.config = config or LLMConfig()
         self._session = None
+        self._aclient = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
         self._selector_cache: Dict[str, List[SelectorSuggestion]] = {}
+        self._semantic_caches: Dict[str, _SemanticCache] = {}
+        # Semantic caching is skipped until this time after an embed call
+        # fails (e.g. the embedding model isn't pulled)
+        self._embed_retry_at = 0.0
+        self._schema_format = True  # Cleared if Ollama rejects a JSON Schema format
+        self._batch_sizer = AdaptiveBatchSizer(
+            initial=self.config.initial_batch_size,
+            min_size=self.config.min_batch_size,
+            max_size=self.config.max_batch_size
+        )
 
         # Setup cache directory
         if self.config.cache_dir:
             self.config.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        if self.config.prewarm:
+            threading.Thread(target=self.warm_up, daemon=True).start()
+
+    def warm_up(self, models: Optional[List[str]] = None) -> List[str]:
+        """
+        Load models into Ollama so the first real call skips the load time.
+
+        Args:
+            models: Models to load (defaults to the configured ones)
+
+        Returns:
+            The models that loaded; none while the system is running hot
+        """
+        if not is_thermal_safe():
+            return []
+
+        if models is None:
+            models = list(dict.fromkeys([
+                self.config.classification_model,
+                self.config.normalization_model,
+                self.config.selector_model
+            ]))
+
+        loaded = []
+        for model in models:
+            try:
+                # A request without a prompt just loads the model
+                response = self._get_session().post(
+                    f"{self.config.ollama_host}/api/generate",
+                    json={"model": model, "keep_alive": self.config.keep_alive},
+                    timeout=self.config.timeout
+                )
+                response.raise_for_status()
+                loaded.append(model)
+            except Exception as e:
+                print(f"[LLM] Warm-up failed for {model}: {e}")
+        return loaded
+
+    def _cache_key(self, *parts: str) -> str:
+        """Hash the parts of a request into a disk cache key."""
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def _response_cache_key(self, model: str, prompt: str, system: str) -> str:
+        """Cache key for an Ollama response; prompt whitespace is collapsed."""
+        return self._cache_key(model, system, " ".join(prompt.split()))
+
+    def _cache_path(self, key: str) -> Optional[Path]:
+        """Location of a cache entry, or None when disk caching is off."""
+        if not self.config.cache_dir:
+            return None
+        return self.config.cache_dir / key[:2] / f"{key}.json"
+
+    def _cache_get(self, key: str) -> Any:
+        """Return a cached value, or None if missing or older than cache_ttl_hours."""
+        path = self._cache_path(key)
+        if path is None:
+            return None
+
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("ts", 0) > self.config.cache_ttl_hours * 3600:
+            return None
+        return entry.get("response")
+
+    def _cache_put(self, key: str, value: Any):
+        """Store a value in the disk cache (best effort)."""
+        path = self._cache_path(key)
+        if path is None:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"response": value, "ts": time.time()}), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as e:
+            print(f"[LLM] Cache write failed: {e}")
+
+    def _semantic_cache_for(self, model: str, system: str) -> Optional[_SemanticCache]:
+        """Semantic cache for one (model, system prompt) pair, if enabled."""
+        if not (HAS_HNSWLIB and self.config.semantic_cache and self.config.cache_dir):
+            return None
+        if time.monotonic() < self._embed_retry_at:
+            return None
+
+        name = self._cache_key(self.config.embedding_model, model, system)[:16]
+        if name not in self._semantic_caches:
+            self._semantic_caches[name] = _SemanticCache(
+                self.config.cache_dir / "semantic", name, self.config.cache_ttl_hours
+            )
+        return self._semantic_caches[name]
+
+    def _embed_payload(self, text: str) -> Dict[str, Any]:
+        """Build an /api/embed request body."""
+        return {"model": self.config.embedding_model, "input": [text]}
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text with the embedding model; None if unavailable."""
+        try:
+            response = self._get_session().post(
+                f"{self.config.ollama_host}/api/embed",
+                json=self._embed_payload(text),
+                timeout=self.config.timeout
+            )
+            response.raise_for_status()
+            return response.json()["embeddings"][0]
+        except Exception:
+            self._embed_retry_at = time.monotonic() + _EMBED_RETRY_SECONDS
+            return None
+
+    async def _aembed(self, text: str) -> Optional[List[float]]:
+        """Async variant of _embed."""
+        try:
+            response = await self._get_async_client().post(
+                "/api/embed",
+                json=self._embed_payload(text)
+            )
+            response.raise_for_status()
+            return response.json()["embeddings"][0]
+        except Exception:
+            self._embed_retry_at = time.monotonic() + _EMBED_RETRY_SECONDS
+            return None
+
     def _wait_for_thermal_safety(self) -> bool:
         """Wait for system to cool down if needed. Returns True if safe to proceed."""
         retries = 0
@@ -153,129 +1167,482 @@ class LLMEnrichment:
         print(f"[LLM] Thermal timeout after {retries} retries")
         return False
 
-    def _call_ollama(self, model: str, prompt: str, system: str = "") -> Optional[str]:
-        """Call Ollama API with thermal safety checks."""
+    async def _await_thermal_safety(self) -> bool:
+        """Async variant of _wait_for_thermal_safety that yields to the event loop."""
+        retries = 0
+        while retries < self.config.max_thermal_retries:
+            if is_thermal_safe():
+                return True
+
+            status = get_thermal_status()
+            print(f"[LLM] Thermal pause - {status.reason}. Waiting {self.config.thermal_wait_seconds}s...")
+            await asyncio.sleep(self.config.thermal_wait_seconds)
+            retries += 1
+
+        print(f"[LLM] Thermal timeout after {retries} retries")
+        return False
+
+    def _build_payload(
+        self,
+        model: str,
+        prompt: str,
+        system: str,
+        schema: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None,
+        rows: int = 1
+    ) -> Dict[str, Any]:
+        """Build an /api/generate request body."""
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "system": system,
+            "stream": True,
+            "keep_alive": self.config.keep_alive,
+            "options": {
+                "temperature": self.config.temperature,
+                "num_predict": self.config.task_max_tokens.get(task, self.config.max_tokens) * rows,
+                "num_ctx": self.config.num_ctx,
+            }
+        }
+        if schema is not None:
+            payload["format"] = schema if self._schema_format else "json"
+            # Unconstrained output often opens with a fence, so stops only
+            # apply here, where they cut off trailing whitespace after the JSON
+            payload["options"]["stop"] = self.config.stop_sequences
+        return payload
+
+    def _schema_rejected(self, status_code: int, payload: Dict[str, Any]) -> bool:
+        """True if a JSON Schema format was refused; later calls send "json"."""
+        if status_code == 400 and isinstance(payload.get("format"), dict):
+            # Ollama before 0.5 only understands format="json"
+            self._schema_format = False
+            payload["format"] = "json"
+            return True
+        return False
+
+    def _report_ollama_error(self, e: Exception):
+        """Log a failed Ollama call, flagging likely thermal kills."""
+        error_msg = str(e).lower()
+        if any(x in error_msg for x in ['connection', 'reset', 'refused', 'closed', 'eof']):
+            print(f"[LLM] Connection lost (possible thermal kill): {e}")
+        else:
+            print(f"[LLM] Ollama error: {e}")
+
+    def _call_ollama(
+        self,
+        model: str,
+        prompt: str,
+        system: str = "",
+        bypass_cache: bool = False,
+        schema: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None,
+        rows: int = 1
+    ) -> Optional[str]:
+        """Call Ollama API with thermal safety checks.
+
+        A JSON Schema in schema constrains decoding to matching output; task
+        picks the output budget from LLMConfig.task_max_tokens, scaled by rows.
+        """
+        cache_key = self._response_cache_key(model, prompt, system)
+        if not bypass_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
         if not self._wait_for_thermal_safety():
             return None
 
         try:
-            import requests
+            import httpx
 
-            url = f"{self.config.ollama_host}/api/generate"
-            payload = {
-                "model": model,
-                "prompt": prompt,
-                "system": system,
-                "stream": False,
-                "options": {
-                    "temperature": self.config.temperature,
-                    "num_predict": self.config.max_tokens,
-                }
-            }
+            payload = self._build_payload(model, prompt, system, schema, task, rows)
+            dispatcher = _get_dispatcher(self.config.ollama_host, self.config.max_concurrency)
 
-            response = requests.post(
-                url,
-                json=payload,
+            text = dispatcher.run(self._generate(payload))
+            if text:
+                self._cache_put(cache_key, text)
+            return text
+
+        except httpx.ConnectError:
+            print(f"[LLM] Ollama not running at {self.config.ollama_host}")
+            print(f"[LLM] Start with: ollama serve")
+            return None
+        except Exception as e:
+            # Check if thermal kill
+            self._report_ollama_error(e)
+            return None
+
+    def _get_session(self):
+        """Return the shared requests.Session, creating it on first use."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # Pooled keep-alive connections; retry brief hiccups (e.g. a model
+            # reload) before the caller sees an error
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=2,
+                    backoff_factor=0.3,
+                    status_forcelist=[502, 503, 504],
+                    allowed_methods=None,
+                    raise_on_status=False
+                )
+            )
+            self._session = requests.Session()
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+
+    def close(self):
+        """Close pooled HTTP connections and write out the semantic caches."""
+        for cache in self._semantic_caches.values():
+            cache.save()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _get_async_client(self):
+        """Return the shared httpx.AsyncClient, creating it for the running loop."""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient = httpx.AsyncClient(
+                base_url=self.config.ollama_host,
                 timeout=self.config.timeout
             )
-            response.raise_for_status()
+            self._aclient_loop = loop
+        return self._aclient
+
+    async def aclose(self):
+        """Close the async HTTP client, if one was opened."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+            self._aclient_loop = None
+
+    def _run_sync(self, coro):
+        """Run an async helper to completion from synchronous code."""
+        async def runner():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
 
-            result = response.json()
-            return result.get("response", "")
+        return asyncio.run(runner())
 
-        except requests.exceptions.ConnectionError:
+    async def _acall_ollama(
+        self,
+        model: str,
+        prompt: str,
+        system: str = "",
+        bypass_cache: bool = False,
+        schema: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None,
+        rows: int = 1
+    ) -> Optional[str]:
+        """Async variant of _call_ollama, so several calls can be in flight at once."""
+        cache_key = self._response_cache_key(model, prompt, system)
+        if not bypass_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        if not await self._await_thermal_safety():
+            return None
+
+        try:
+            import httpx
+
+            text = await self._generate(
+                self._build_payload(model, prompt, system, schema, task, rows)
+            )
+            if text:
+                self._cache_put(cache_key, text)
+            return text
+
+        except httpx.ConnectError:
             print(f"[LLM] Ollama not running at {self.config.ollama_host}")
             print(f"[LLM] Start with: ollama serve")
             return None
         except Exception as e:
-            # Check if thermal kill
-            error_msg = str(e).lower()
-            if any(x in error_msg for x in ['connection', 'reset', 'refused', 'closed', 'eof']):
-                print(f"[LLM] Connection lost (possible thermal kill): {e}")
-            else:
-                print(f"[LLM] Ollama error: {e}")
+            self._report_ollama_error(e)
             return None
 
+    async def _generate(self, payload: Dict[str, Any]) -> str:
+        """
+        Run one generation through the dispatcher.
+
+        Retries with format="json" if Ollama refuses a schema. A thermal
+        abort returns the partial text when it already holds the JSON, and
+        otherwise retries once after the system cools down.
+        """
+        import httpx
+
+        dispatcher = _get_dispatcher(self.config.ollama_host, self.config.max_concurrency)
+        thermal_retry = True
+        while True:
+            try:
+                return await dispatcher.asubmit(
+                    lambda client: self._stream_generate(client, payload),
+                    payload["model"]
+                )
+            except httpx.HTTPStatusError as e:
+                if not self._schema_rejected(e.response.status_code, payload):
+                    raise
+            except _ThermalAbort as abort:
+                if self._parse_json_response(abort.partial) is not None:
+                    return abort.partial
+                print("[LLM] Thermal limit reached mid-generation, stopped early")
+                if not thermal_retry or not await self._await_thermal_safety():
+                    raise
+                thermal_retry = False
+
+    async def _stream_generate(self, client, payload: Dict[str, Any]) -> str:
+        """Stream a generation, stopping once its JSON is complete or the system runs hot."""
+        parts: List[str] = []
+        # Leaving the block closes the connection, which stops Ollama generating
+        async with client.stream(
+            "POST", "/api/generate", json=payload, timeout=self.config.timeout
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(chunk["error"])
+
+                piece = chunk.get("response", "")
+                parts.append(piece)
+                if chunk.get("done"):
+                    break
+                if "}" in piece and payload.get("format") and _is_complete_json("".join(parts)):
+                    break
+                if not is_thermal_safe():
+                    raise _ThermalAbort("".join(parts))
+
+        return "".join(parts)
+
+    def _cached_call_ollama(
+        self,
+        model: str,
+        prompt: str,
+        system: str = "",
+        bypass_cache: bool = False,
+        schema: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None
+    ) -> Optional[str]:
+        """_call_ollama with a semantic cache tier after the exact-match one."""
+        semantic = None if bypass_cache else self._semantic_cache_for(model, system)
+        if semantic is None:
+            return self._call_ollama(model, prompt, system, bypass_cache, schema, task)
+
+        cached = self._cache_get(self._response_cache_key(model, prompt, system))
+        if cached is not None:
+            return cached
+
+        vector = self._embed(prompt)
+        if vector:
+            hit = semantic.lookup(vector, self.config.semantic_threshold)
+            if hit is not None:
+                return hit
+
+        response = self._call_ollama(model, prompt, system, schema=schema, task=task)
+        if response and vector:
+            semantic.add(vector, response)
+        return response
+
+    async def _acached_call_ollama(
+        self,
+        model: str,
+        prompt: str,
+        system: str = "",
+        bypass_cache: bool = False,
+        schema: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None
+    ) -> Optional[str]:
+        """Async variant of _cached_call_ollama."""
+        semantic = None if bypass_cache else self._semantic_cache_for(model, system)
+        if semantic is None:
+            return await self._acall_ollama(model, prompt, system, bypass_cache, schema, task)
+
+        cached = self._cache_get(self._response_cache_key(model, prompt, system))
+        if cached is not None:
+            return cached
+
+        vector = await self._aembed(prompt)
+        if vector:
+            hit = semantic.lookup(vector, self.config.semantic_threshold)
+            if hit is not None:
+                return hit
+
+        response = await self._acall_ollama(model, prompt, system, schema=schema, task=task)
+        if response and vector:
+            semantic.add(vector, response)
+        return response
+
     def _parse_json_response(self, response: str) -> Optional[dict]:
         """Extract JSON from LLM response."""
         if not response:
             return None
 
-        # Try to find JSON in response
-        try:
-            # First try direct parse
-            return json.loads(response)
-        except json.JSONDecodeError:
-            pass
-
-        # Try to extract JSON from markdown code block
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response)
-        if json_match:
-            try:
-                return json.loads(json_match.group(1))
-            except json.JSONDecodeError:
-                pass
+        text = response.strip()
+        candidates = []
+
+        # A response that already starts with JSON needs no fence search
+        if text.startswith(("{", "[")):
+            candidates.append(text)
+        else:
+            # Try to extract JSON from markdown code block
+            json_match = _JSON_FENCE_RE.search(text)
+            if json_match:
+                candidates.append(json_match.group(1))
 
         # Try to find JSON object in response
-        json_match = re.search(r'\{[\s\S]*\}', response)
-        if json_match:
+        json_match = _JSON_OBJECT_RE.search(text)
+        if json_match and json_match.group(0) not in candidates:
+            candidates.append(json_match.group(0))
+
+        for candidate in candidates:
             try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
+                return orjson.loads(candidate) if HAS_ORJSON else json.loads(candidate)
+            except ValueError:
                 pass
 
+        # Recovery for LLM quirks such as trailing commas and unquoted keys
+        if HAS_JSON5:
+            for candidate in candidates:
+                try:
+                    return json5.loads(candidate)
+                except ValueError:
+                    pass
+
         return None
 
-    def classify_business(self, page_text: str, url: str = "") -> ClassificationResult:
+    def classify_business(
+        self,
+        page_text: str,
+        url: str = "",
+        bypass_cache: bool = False
+    ) -> ClassificationResult:
         """
         Classify a business based on page content.
 
         Args:
             page_text: Cleaned text content from the page
             url: Optional URL for context
+            bypass_cache: Skip the response cache and ask the model again
 
         Returns:
             ClassificationResult with business type, employee bucket, confidence, and evidence
         """
-        result = ClassificationResult()
+        ruled = self._rule_classify(page_text)
+        if ruled is not None:
+            return ruled
 
+        response = self._cached_call_ollama(
+            self.config.classification_model,
+            self._classification_prompt(page_text, url),
+            _CLASSIFICATION_SYSTEM_PROMPT,
+            bypass_cache,
+            _CLASSIFICATION_SCHEMA,
+            "classify"
+        )
+        return self._parse_classification(response, page_text)
+
+    async def aclassify_business(
+        self,
+        page_text: str,
+        url: str = "",
+        bypass_cache: bool = False
+    ) -> ClassificationResult:
+        """Async variant of classify_business."""
+        ruled = self._rule_classify(page_text)
+        if ruled is not None:
+            return ruled
+
+        response = await self._acached_call_ollama(
+            self.config.classification_model,
+            self._classification_prompt(page_text, url),
+            _CLASSIFICATION_SYSTEM_PROMPT,
+            bypass_cache,
+            _CLASSIFICATION_SCHEMA,
+            "classify"
+        )
+        return self._parse_classification(response, page_text)
+
+    def _rule_classify(self, page_text: str) -> Optional[ClassificationResult]:
+        """Classify from keyword rules alone; None when the page is not clear-cut."""
+        if not self.config.rule_classification:
+            return None
+
+        products = [m.group() for m in _PRODUCT_RE.finditer(page_text)]
+        services = [m.group() for m in _SERVICE_RE.finditer(page_text)]
+
+        # Only one-sided pages qualify; mixed signals go to the model
+        if products and not services:
+            business_type, matches = BusinessType.PRODUCTS, products
+        elif services and not products:
+            business_type, matches = BusinessType.SERVICES, services
+        else:
+            return None
+
+        # Score distinct phrases; one button repeated on every tile is one signal
+        phrases = list(dict.fromkeys(m.lower() for m in matches))
+        confidence = min(0.95, 0.75 + 0.05 * len(phrases))
+        if confidence <= self.config.rule_confidence:
+            return None
+
+        result = ClassificationResult(business_type=business_type, confidence=confidence)
+        result.evidence = [
+            {"field": "business_type", "snippet": snippet, "weight": "strong"}
+            for snippet in phrases
+        ]
+
+        employees = _EMPLOYEE_RE.search(page_text)
+        if employees:
+            count = int((employees.group(1) or employees.group(2)).replace(",", ""))
+            if count <= 10:
+                result.employee_bucket = EmployeeBucket.TINY
+            elif count <= 50:
+                result.employee_bucket = EmployeeBucket.SMALL
+            elif count <= 200:
+                result.employee_bucket = EmployeeBucket.MEDIUM
+            elif count <= 1000:
+                result.employee_bucket = EmployeeBucket.LARGE
+            else:
+                result.employee_bucket = EmployeeBucket.ENTERPRISE
+            result.evidence.append(
+                {"field": "employee_bucket", "snippet": employees.group(), "weight": "strong"}
+            )
+
+        return result
+
+    def _classification_prompt(self, page_text: str, url: str) -> str:
+        """Build the classification user prompt."""
         # Truncate text to reasonable size
         max_chars = 4000
         if len(page_text) > max_chars:
             page_text = page_text[:max_chars] + "\n[truncated]"
 
-        system_prompt = """You are a business analyst. Analyze the provided webpage content and classify the business.
-
-Output valid JSON only with this exact structure:
-{
-    "business_type": "products" | "services" | "both" | "unknown",
-    "employee_bucket": "1-10" | "11-50" | "51-200" | "201-1000" | "1000+" | "unknown",
-    "confidence": 0.0-1.0,
-    "evidence": [
-        {"field": "business_type", "snippet": "exact quote from text", "weight": "strong|moderate|weak"},
-        {"field": "employee_bucket", "snippet": "exact quote from text", "weight": "strong|moderate|weak"}
-    ]
-}
-
-Rules:
-- business_type: "products" if they sell physical/digital products, "services" if they provide services, "both" if mixed
-- employee_bucket: Look for phrases like "team of X", "X employees", company size indicators
-- confidence: Your certainty (0.9+ needs strong evidence, 0.5-0.7 for reasonable inference)
-- evidence: Quote the EXACT text that led to each decision"""
-
-        user_prompt = f"""URL: {url}
+        return f"""URL: {url}
 
 Page content:
 {page_text}
 
 Classify this business. Output JSON only."""
 
-        response = self._call_ollama(
-            self.config.classification_model,
-            user_prompt,
-            system_prompt
-        )
-
+    def _parse_classification(self, response: Optional[str], page_text: str) -> ClassificationResult:
+        """Turn a classification response into a ClassificationResult."""
+        result = ClassificationResult()
         result.raw_response = response or ""
 
         parsed = self._parse_json_response(response)
@@ -299,7 +1666,7 @@ Classify this business. Output JSON only."""
             }.get(eb, EmployeeBucket.UNKNOWN)
 
             result.confidence = float(parsed.get("confidence", 0.0))
-            result.evidence = parsed.get("evidence", [])
+            result.evidence = _locate_evidence(parsed.get("evidence") or [], page_text)
 
         return result
 
@@ -308,7 +1675,8 @@ Classify this business. Output JSON only."""
         html: str,
         field_names: List[str],
         failed_selectors: Optional[Dict[str, str]] = None,
-        domain: str = ""
+        domain: str = "",
+        bypass_cache: bool = False
     ) -> List[SelectorSuggestion]:
         """
         Generate CSS selectors for fields when extraction fails.
@@ -318,22 +1686,29 @@ Classify this business. Output JSON only."""
             field_names: List of field names to extract
             failed_selectors: Previous selectors that didn't work
             domain: Domain for cache key
+            bypass_cache: Skip the selector and response caches
 
         Returns:
             List of SelectorSuggestion for each field
         """
         # Check cache first
         cache_key = self._get_selector_cache_key(html, field_names, domain)
-        if cache_key in self._selector_cache:
-            return self._selector_cache[cache_key]
+        disk_key = self._cache_key("selectors", cache_key)
+        if not bypass_cache:
+            if cache_key in self._selector_cache:
+                return self._selector_cache[cache_key]
+
+            cached = self._cache_get(disk_key)
+            if cached:
+                suggestions = [SelectorSuggestion(**item) for item in cached]
+                self._selector_cache[cache_key] = suggestions
+                return suggestions
 
         # Simplify HTML for prompt (remove scripts, styles, keep structure)
         simplified_html = self._simplify_html(html)
 
-        # Truncate if too long
-        max_chars = 6000
-        if len(simplified_html) > max_chars:
-            simplified_html = simplified_html[:max_chars] + "\n<!-- truncated -->"
+        # Keep the most field-like parts if too long
+        simplified_html = _trim_html(simplified_html, 6000)
 
         failed_info = ""
         if failed_selectors:
@@ -372,7 +1747,10 @@ Generate CSS selectors. Output JSON only."""
         response = self._call_ollama(
             self.config.selector_model,
             user_prompt,
-            system_prompt
+            system_prompt,
+            bypass_cache,
+            _SELECTORS_SCHEMA,
+            "selectors"
         )
 
         suggestions = []
@@ -391,59 +1769,70 @@ Generate CSS selectors. Output JSON only."""
         # Cache results
         if suggestions:
             self._selector_cache[cache_key] = suggestions
+            self._cache_put(disk_key, [asdict(suggestion) for suggestion in suggestions])
 
         return suggestions
 
-    def normalize_entity(self, entity_data: Dict[str, Any]) -> NormalizedEntity:
+    def normalize_entity(
+        self,
+        entity_data: Dict[str, Any],
+        bypass_cache: bool = False
+    ) -> NormalizedEntity:
         """
         Normalize and canonicalize an entity record.
 
         Args:
             entity_data: Raw scraped entity data
+            bypass_cache: Skip the response cache and ask the model again
 
         Returns:
             NormalizedEntity with canonical fields
         """
-        result = NormalizedEntity()
-        result.source_variants = [str(v) for v in entity_data.values() if v]
+        response = self._cached_call_ollama(
+            self.config.normalization_model,
+            self._normalization_prompt(entity_data),
+            _NORMALIZATION_SYSTEM_PROMPT,
+            bypass_cache,
+            _NORMALIZATION_SCHEMA,
+            "normalize"
+        )
+        return self._parse_normalization(entity_data, response)
 
+    async def anormalize_entity(
+        self,
+        entity_data: Dict[str, Any],
+        bypass_cache: bool = False
+    ) -> NormalizedEntity:
+        """Async variant of normalize_entity."""
+        response = await self._acached_call_ollama(
+            self.config.normalization_model,
+            self._normalization_prompt(entity_data),
+            _NORMALIZATION_SYSTEM_PROMPT,
+            bypass_cache,
+            _NORMALIZATION_SCHEMA,
+            "normalize"
+        )
+        return self._parse_normalization(entity_data, response)
+
+    def _normalization_prompt(self, entity_data: Dict[str, Any]) -> str:
+        """Build the normalization user prompt."""
         # Build entity string for analysis
         entity_str = json.dumps(entity_data, indent=2)
 
-        system_prompt = """You are a data normalization expert. Canonicalize the entity record.
-
-Output valid JSON only with this structure:
-{
-    "legal_name": "Full legal company name",
-    "brand_name": "Common brand/trade name",
-    "domain": "primary domain without www",
-    "hq_city": "Headquarters city",
-    "hq_state": "State/province code",
-    "hq_country": "Country code (US, UK, etc)",
-    "industry": "Primary industry category",
-    "is_b2b": true/false/null,
-    "confidence": 0.0-1.0
-}
-
-Rules:
-- legal_name: Official registered name (Inc, LLC, Corp, etc)
-- brand_name: What customers call it
-- domain: Extract from website/email, normalize (no www, https)
-- is_b2b: true if primarily B2B, false if B2C, null if unclear
-- Normalize all text: proper capitalization, consistent formatting"""
-
-        user_prompt = f"""Normalize this entity:
+        return f"""Normalize this entity:
 {entity_str}
 
 Output JSON only."""
 
-        response = self._call_ollama(
-            self.config.normalization_model,
-            user_prompt,
-            system_prompt
-        )
+    def _parse_normalization(self, entity_data: Dict[str, Any], response: Optional[str]) -> NormalizedEntity:
+        """Turn a normalization response into a NormalizedEntity."""
+        return self._normalized_entity(entity_data, self._parse_json_response(response))
+
+    def _normalized_entity(self, entity_data: Dict[str, Any], parsed: Optional[dict]) -> NormalizedEntity:
+        """Build a NormalizedEntity from one parsed normalization record."""
+        result = NormalizedEntity()
+        result.source_variants = [str(v) for v in entity_data.values() if v]
 
-        parsed = self._parse_json_response(response)
         if parsed:
             result.legal_name = parsed.get("legal_name", "")
             result.brand_name = parsed.get("brand_name", "")
@@ -457,7 +1846,12 @@ Output JSON only."""
 
         return result
 
-    def analyze_page_fields(self, html: str, url: str = "") -> List[DetectedField]:
+    def analyze_page_fields(
+        self,
+        html: str,
+        url: str = "",
+        bypass_cache: bool = False
+    ) -> List[DetectedField]:
         """
         AI-powered page analysis to detect business fields.
 
@@ -467,6 +1861,7 @@ Output JSON only."""
         Args:
             html: Full HTML content of the page
             url: Optional URL for context
+            bypass_cache: Skip the response cache and ask the model again
 
         Returns:
             List of DetectedField with selectors for each detected field
@@ -474,10 +1869,8 @@ Output JSON only."""
         # Simplify HTML for prompt
         simplified_html = self._simplify_html(html)
 
-        # Truncate if too long
-        max_chars = 8000
-        if len(simplified_html) > max_chars:
-            simplified_html = simplified_html[:max_chars] + "\n<!-- truncated -->"
+        # Keep the most field-like parts if too long
+        simplified_html = _trim_html(simplified_html, 8000)
 
         system_prompt = """You are a web scraping expert. Analyze the PROVIDED HTML and extract CSS selectors for business data.
 
@@ -530,7 +1923,10 @@ Return JSON with selectors derived from the actual HTML above. Do not guess or i
         response = self._call_ollama(
             self.config.selector_model,  # Use coder model for better selector generation
             user_prompt,
-            system_prompt
+            system_prompt,
+            bypass_cache,
+            _FIELDS_SCHEMA,
+            "analyze"
         )
 
         fields = []
@@ -555,59 +1951,160 @@ Return JSON with selectors derived from the actual HTML above. Do not guess or i
     def batch_normalize(
         self,
         entities: List[Dict[str, Any]],
-        batch_size: int = 5
+        batch_size: Optional[int] = None,
+        bypass_cache: bool = False
     ) -> List[NormalizedEntity]:
         """
-        Normalize multiple entities in batches.
+        Normalize multiple entities, several per prompt.
 
         Args:
             entities: List of raw entity data
-            batch_size: Entities per LLM call
+            batch_size: Entities packed into each prompt; None adapts the
+                size to how recent batches went
+            bypass_cache: Skip the response cache and ask the model again
 
         Returns:
-            List of NormalizedEntity
+            List of NormalizedEntity, in input order
         """
-        results = []
+        return self._run_sync(self.abatch_normalize(entities, batch_size, bypass_cache))
 
-        for i in range(0, len(entities), batch_size):
-            batch = entities[i:i + batch_size]
-
-            for entity in batch:
-                result = self.normalize_entity(entity)
-                results.append(result)
-
-                # Check thermal between each call
-                if not is_thermal_safe():
-                    print(f"[LLM] Pausing batch normalization due to thermal limits")
-                    self._wait_for_thermal_safety()
-
-        return results
+    async def abatch_normalize(
+        self,
+        entities: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        bypass_cache: bool = False
+    ) -> List[NormalizedEntity]:
+        """Normalize entities in chunks, at most max_concurrency chunks in flight."""
+        concurrency = max(1, self.config.max_concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        # The same company scraped from several pages is normalized once
+        # and fanned back out to every index that shares it
+        first_seen: Dict[bytes, int] = {}
+        unique: List[Dict[str, Any]] = []
+        slots = []
+        for entity in entities:
+            key = _entity_key(entity)
+            if key not in first_seen:
+                first_seen[key] = len(unique)
+                unique.append(entity)
+            slots.append(first_seen[key])
+
+        # Entities answered before, alone or in another batch, skip the model
+        normalized: List[Optional[NormalizedEntity]] = [None] * len(unique)
+        if not bypass_cache:
+            for i, entity in enumerate(unique):
+                cached = self._cache_get(self._entity_cache_key(entity))
+                if cached is not None:
+                    normalized[i] = self._parse_normalization(entity, cached)
+        pending = [i for i, result in enumerate(normalized) if result is None]
+
+        async def normalize_chunk(chunk: List[Dict[str, Any]]) -> List[NormalizedEntity]:
+            # Each call re-checks thermal state before it is dispatched
+            async with semaphore:
+                if len(chunk) == 1:
+                    return [await self.anormalize_entity(chunk[0], bypass_cache)]
+                response = await self._acall_ollama(
+                    self.config.normalization_model,
+                    self._normalize_batch_prompt(chunk),
+                    _NORMALIZATION_BATCH_SYSTEM_PROMPT,
+                    bypass_cache,
+                    _NORMALIZATION_BATCH_SCHEMA,
+                    "normalize",
+                    len(chunk)
+                )
+
+            rows = self._parse_batch_results(response, len(chunk))
+            dropped = rows.count(None)
+            if response is None or dropped * 2 > len(chunk):
+                self._batch_sizer.on_failure()
+            elif not dropped:
+                self._batch_sizer.on_success()
+            results: List[Optional[NormalizedEntity]] = []
+            for entity, row in zip(chunk, rows):
+                if row:
+                    # Cache each row as if the entity had been sent alone
+                    row = {k: v for k, v in row.items() if k != "index"}
+                    self._cache_put(self._entity_cache_key(entity), json.dumps(row))
+                results.append(self._normalized_entity(entity, row) if row else None)
+
+            # Rows the model dropped or mangled get a call of their own
+            missing = [i for i, result in enumerate(results) if result is None]
+            if missing:
+                async def retry(i: int) -> NormalizedEntity:
+                    async with semaphore:
+                        return await self.anormalize_entity(chunk[i], bypass_cache)
+
+                for i, result in zip(missing, await asyncio.gather(*(retry(i) for i in missing))):
+                    results[i] = result
+            return results
+
+        # Chunks are cut as earlier ones finish, so each picks up the
+        # sizer's latest feedback
+        position = 0
+        running: Dict[asyncio.Task, List[int]] = {}
+        while position < len(pending) or running:
+            while position < len(pending) and len(running) < concurrency:
+                size = max(1, batch_size or self._batch_sizer.current())
+                chunk = pending[position:position + size]
+                position += size
+                task = asyncio.ensure_future(normalize_chunk([unique[i] for i in chunk]))
+                running[task] = chunk
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                chunk = running.pop(task)
+                failed = task.exception() is not None
+                for slot, i in enumerate(chunk):
+                    if failed:
+                        normalized[i] = self._normalized_entity(unique[i], None)
+                    else:
+                        normalized[i] = task.result()[slot]
+
+        return [
+            normalized[slot] if entity is unique[slot]
+            else replace(normalized[slot], source_variants=[str(v) for v in entity.values() if v])
+            for entity, slot in zip(entities, slots)
+        ]
+
+    def _entity_cache_key(self, entity: Dict[str, Any]) -> str:
+        """Response cache key normalize_entity would use for this entity."""
+        return self._response_cache_key(
+            self.config.normalization_model,
+            self._normalization_prompt(entity),
+            _NORMALIZATION_SYSTEM_PROMPT
+        )
 
-    def _simplify_html(self, html: str) -> str:
-        """Remove scripts, styles, and simplify HTML for LLM analysis."""
-        try:
-            from bs4 import BeautifulSoup
+    def _normalize_batch_prompt(self, entities: List[Dict[str, Any]]) -> str:
+        """Build one prompt carrying several entities, numbered by index."""
+        batch = {"entities": [{"index": i, **entity} for i, entity in enumerate(entities)]}
 
-            soup = BeautifulSoup(html, 'html.parser')
+        return f"""Normalize these {len(entities)} entities:
+{json.dumps(batch, indent=2)}
 
-            # Remove script and style elements
-            for tag in soup(['script', 'style', 'noscript', 'iframe', 'svg']):
-                tag.decompose()
+Output JSON only."""
 
-            # Remove comments
-            from bs4 import Comment
-            for comment in soup.find_all(string=lambda t: isinstance(t, Comment)):
-                comment.extract()
+    def _parse_batch_results(self, response: Optional[str], count: int) -> List[Optional[dict]]:
+        """Map a batch response's results back to input slots by index."""
+        rows: List[Optional[dict]] = [None] * count
+        parsed = self._parse_json_response(response)
+        if not parsed or not isinstance(parsed.get("results"), list):
+            return rows
 
-            # Get simplified HTML
-            return soup.prettify()
+        for item in parsed["results"]:
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.get("index"))
+            except (ValueError, TypeError):
+                continue
+            if 0 <= index < count and rows[index] is None:
+                rows[index] = item
+        return rows
 
-        except ImportError:
-            # Fallback: basic regex cleanup
-            html = re.sub(r'<script[^>]*>[\s\S]*?</script>', '', html, flags=re.IGNORECASE)
-            html = re.sub(r'<style[^>]*>[\s\S]*?</style>', '', html, flags=re.IGNORECASE)
-            html = re.sub(r'<!--[\s\S]*?-->', '', html)
-            return html
+    def _simplify_html(self, html: str) -> str:
+        """Remove scripts, styles, and simplify HTML for LLM analysis."""
+        return _simplify_html(html)
 
     def _get_selector_cache_key(
         self,
@@ -617,13 +2114,13 @@ Return JSON with selectors derived from the actual HTML above. Do not guess or i
     ) -> str:
         """Generate cache key for selector suggestions."""
         # Hash HTML structure (not content) for cache key
-        structure_hash = hashlib.md5(
-            self._simplify_html(html)[:2000].encode()
-        ).hexdigest()[:8]
+        structure_hash = hashlib.blake2b(
+            self._simplify_html(html)[:4096].encode(), digest_size=4
+        ).hexdigest()
 
-        fields_hash = hashlib.md5(
-            ','.join(sorted(field_names)).encode()
-        ).hexdigest()[:8]
+        fields_hash = hashlib.blake2b(
+            ','.join(sorted(field_names)).encode(), digest_size=4
+        ).hexdigest()
 
         return f"{domain}:{structure_hash}:{fields_hash}"
 
@@ -633,7 +2130,7 @@ Return JSON with selectors derived from the actual HTML above. Do not guess or i
             import requests
 
             # Check server
-            response = requests.get(
+            response = self._get_session().get(
                 f"{self.config.ollama_host}/api/tags",
                 timeout=5
             )
@@ -648,12 +2145,14 @@ Return JSON with selectors derived from the actual HTML above. Do not guess or i
                 self.config.selector_model,
                 self.config.normalization_model
             ]
+            if HAS_HNSWLIB and self.config.semantic_cache:
+                needed.append(self.config.embedding_model)
 
             missing = []
-            for model in set(needed):
-                # Check if model or its base is available
-                model_base = model.split(':')[0]
-                if not any(model_base in m for m in models):
+            for model in dict.fromkeys(needed):
+                # Match the full tag so a different quantization doesn't count
+                tag = model if ':' in model else f"{model}:latest"
+                if tag not in models:
                     missing.append(model)
 
             if missing:
@@ -1,19 +1,28 @@
 """Proxy manager with health checks and rotation for Parsonic."""
 
 import asyncio
+import heapq
 import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Literal, Optional
 
 import httpx
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
 
-@dataclass
+
+@dataclass(slots=True)
 class ProxyStatus:
     """Status information for a single proxy."""
     url: str
     is_healthy: bool = True
-    last_check: float = 0
+    last_check: float = 0  # time.monotonic() of the last health check, 0 if never
     response_time_ms: float = 0
     fail_count: int = 0
     success_count: int = 0
@@ -27,8 +36,14 @@ class ProxyPool:
     current_index: int = 0
     health_check_url: str = "https://httpbin.org/ip"
     health_check_interval: float = 300.0  # 5 minutes
+    fresh_ttl: float = 60.0  # Results younger than this are trusted as-is
+    stale_ttl: float = 600.0  # Results older than this must be re-checked before use
     max_fail_count: int = 3
+    # Proxies reaching max_fail_count * quarantine_factor consecutive
+    # failures are moved out of the pool until reset_all()
+    quarantine_factor: int = 4
     timeout: float = 10.0
+    policy: str = "round_robin"  # round_robin, least_load
 
 
 class ProxyManager:
@@ -40,67 +55,216 @@ class ProxyManager:
         health_check_url: str = "https://httpbin.org/ip",
         health_check_interval: float = 300.0,
         max_fail_count: int = 3,
-        timeout: float = 10.0
+        timeout: float = 10.0,
+        concurrency: int = 50,
+        policy: str = "round_robin"
     ):
         self.pool = ProxyPool(
             health_check_url=health_check_url,
             health_check_interval=health_check_interval,
             max_fail_count=max_fail_count,
-            timeout=timeout
+            timeout=timeout,
+            policy=policy
         )
 
         # Initialize proxy statuses
         for proxy in proxies:
             self.pool.proxies[proxy] = ProxyStatus(url=proxy)
 
+        # Healthy proxies in rotation order, kept in sync with is_healthy so
+        # rotation never has to scan the whole pool
+        self._healthy: deque[str] = deque(self.pool.proxies)
+        self._healthy_set: set[str] = set(self.pool.proxies)
+
+        # Min-heap of (last_check, url) so stale proxies are found without
+        # scanning the pool. Entries are pushed on every check and outdated
+        # ones are skipped when popped.
+        self._by_check: list[tuple[float, str]] = [(0, url) for url in self.pool.proxies]
+
+        # Quarantined proxies, kept out of rotation, recovery and statistics
+        self._dead: dict[str, ProxyStatus] = {}
+
+        # Running totals behind get_statistics, updated wherever the
+        # underlying ProxyStatus fields change
+        self._stats = {"success": 0, "fail": 0, "rt_sum": 0.0, "rt_n": 0}
+
+        # Requests currently running through each proxy (see acquire)
+        self._inflight: dict[str, int] = defaultdict(int)
+
+        # Set once the health check URL is seen to reject HEAD requests
+        self._head_unsupported = False
+
+        # Background re-checks in progress, so each proxy has at most one
+        self._revalidating: dict[str, asyncio.Task] = {}
+
+        # Bounds how many health checks run at once
+        self._sem = asyncio.Semaphore(concurrency)
+
+        # One keep-alive client per proxy, since transports are proxy-bound
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
     @property
     def healthy_proxies(self) -> list[str]:
         """Get list of healthy proxies."""
-        return [
-            url for url, status in self.pool.proxies.items()
-            if status.is_healthy
-        ]
+        return list(self._healthy)
 
     @property
     def all_proxies(self) -> list[ProxyStatus]:
         """Get all proxy statuses."""
         return list(self.pool.proxies.values())
 
+    def _set_healthy(self, proxy_url: str, healthy: bool):
+        """Update a proxy's health and keep the rotation in sync."""
+        status = self.pool.proxies.get(proxy_url)
+        if status is None:
+            return  # Removed or quarantined meanwhile
+        status.is_healthy = healthy
+        if healthy:
+            if proxy_url not in self._healthy_set:
+                self._healthy_set.add(proxy_url)
+                self._healthy.append(proxy_url)
+        elif proxy_url in self._healthy_set:
+            self._healthy_set.discard(proxy_url)
+            self._healthy.remove(proxy_url)
+
+    def _recover(self):
+        """Put proxies that have not failed too often back into rotation."""
+        for proxy_url, status in self.pool.proxies.items():
+            if status.fail_count < self.pool.max_fail_count * 2:
+                self._set_healthy(proxy_url, True)
+
     def get_next_proxy(self) -> Optional[str]:
         """Get next healthy proxy from the pool."""
-        healthy = self.healthy_proxies
-
-        if not healthy:
+        if not self._healthy:
             # Try to recover - reset all proxies
-            for status in self.pool.proxies.values():
-                if status.fail_count < self.pool.max_fail_count * 2:
-                    status.is_healthy = True
-            healthy = self.healthy_proxies
+            self._recover()
 
-        if not healthy:
+        if not self._healthy:
             return None
 
-        self.pool.current_index = (self.pool.current_index + 1) % len(healthy)
-        return healthy[self.pool.current_index]
+        self._healthy.rotate(-1)
+        if self.pool.policy == "round_robin":
+            return self._healthy[0]
+
+        # Least load: of the next two proxies in rotation, take the one that
+        # is faster and more reliable with fewer requests in flight.
+        # Choosing between two keeps traffic spread across the pool while
+        # still favouring the better proxy.
+        first = self._healthy[0]
+        if len(self._healthy) == 1:
+            return first
+        second = self._healthy[1]
+        return second if self._load_score(second) < self._load_score(first) else first
+
+    def _load_score(self, proxy_url: str) -> float:
+        """Expected cost of sending one more request through a proxy (lower is better)."""
+        status = self.pool.proxies[proxy_url]
+        # Unmeasured proxies are assumed to be average, not free
+        response_time = status.response_time_ms
+        if response_time <= 0:
+            stats = self._stats
+            response_time = stats["rt_sum"] / stats["rt_n"] if stats["rt_n"] else 1.0
+        # Success rate, floored so a failing proxy is penalised rather than
+        # excluded; no history counts as reliable until shown otherwise
+        attempts = status.success_count + status.fail_count
+        success_rate = max(status.success_count / attempts, 0.05) if attempts else 1.0
+        return (1 + self._inflight.get(proxy_url, 0)) * response_time / success_rate
+
+    def _freshness(self, status: ProxyStatus) -> Literal["fresh", "stale", "expired"]:
+        """Classify how much a proxy's last health check can be trusted."""
+        if not status.last_check:
+            # Never checked: usable, but worth checking soon
+            return "stale"
+        age = time.monotonic() - status.last_check
+        if age < self.pool.fresh_ttl:
+            return "fresh"
+        if age < self.pool.stale_ttl:
+            return "stale"
+        return "expired"
+
+    def _revalidate(self, proxy_url: str) -> asyncio.Task:
+        """Start a background health check unless one is already running."""
+        task = self._revalidating.get(proxy_url)
+        if task is None:
+            task = asyncio.create_task(self._check_with_sem(proxy_url))
+            self._revalidating[proxy_url] = task
+            task.add_done_callback(lambda _t: self._revalidating.pop(proxy_url, None))
+        return task
+
+    async def aget_next_proxy(self) -> Optional[str]:
+        """
+        Get next healthy proxy, keeping health results current.
+
+        Stale results are re-checked in the background while the proxy is
+        used; expired ones are re-checked before the proxy is returned.
+        """
+        for _ in range(len(self.pool.proxies) + 1):
+            proxy_url = self.get_next_proxy()
+            if proxy_url is None:
+                return None
+
+            freshness = self._freshness(self.pool.proxies[proxy_url])
+            if freshness == "stale":
+                self._revalidate(proxy_url)
+            elif freshness == "expired":
+                if not await asyncio.shield(self._revalidate(proxy_url)):
+                    continue
+            return proxy_url
+
+        return None
+
+    @asynccontextmanager
+    async def acquire(self, proxy_url: Optional[str] = None):
+        """Pick a proxy (or use proxy_url) and count it as in flight until exit."""
+        if proxy_url is None:
+            proxy_url = self.get_next_proxy()
+        if proxy_url is None:
+            yield None
+            return
+
+        self._inflight[proxy_url] += 1
+        try:
+            yield proxy_url
+        finally:
+            self._inflight[proxy_url] -= 1
+            if self._inflight[proxy_url] <= 0:
+                del self._inflight[proxy_url]
+
+    def _record_response_time(self, status: ProxyStatus, elapsed_ms: float):
+        """Fold a new measurement into the proxy's smoothed response time."""
+        previous = status.response_time_ms
+        if previous > 0:
+            status.response_time_ms = 0.8 * previous + 0.2 * elapsed_ms
+        else:
+            status.response_time_ms = elapsed_ms
+            self._stats["rt_n"] += 1
+        self._stats["rt_sum"] += status.response_time_ms - previous
 
-    def mark_success(self, proxy_url: str):
+    def mark_success(self, proxy_url: str, response_time_ms: Optional[float] = None):
         """Mark a proxy as successful."""
         if proxy_url in self.pool.proxies:
             status = self.pool.proxies[proxy_url]
+            if response_time_ms is not None:
+                self._record_response_time(status, response_time_ms)
             status.success_count += 1
+            self._stats["success"] += 1
+            self._stats["fail"] -= status.fail_count
             status.fail_count = 0
-            status.is_healthy = True
             status.last_error = None
+            self._set_healthy(proxy_url, True)
 
     def mark_failure(self, proxy_url: str, error: str = None):
         """Mark a proxy as failed."""
         if proxy_url in self.pool.proxies:
             status = self.pool.proxies[proxy_url]
             status.fail_count += 1
+            self._stats["fail"] += 1
             status.last_error = error
 
-            if status.fail_count >= self.pool.max_fail_count:
-                status.is_healthy = False
+            if status.fail_count >= self.pool.max_fail_count * self.pool.quarantine_factor:
+                self._dead[proxy_url] = self._detach(proxy_url)
+            elif status.fail_count >= self.pool.max_fail_count:
+                self._set_healthy(proxy_url, False)
 
     async def check_proxy(self, proxy_url: str) -> bool:
         """Check if a single proxy is healthy."""
@@ -108,88 +272,188 @@ class ProxyManager:
         if not status:
             return False
 
-        start_time = time.time()
+        start_time = time.monotonic()
 
         try:
-            transport = httpx.AsyncHTTPTransport(proxy=proxy_url)
-            async with httpx.AsyncClient(
-                transport=transport,
-                timeout=self.pool.timeout
-            ) as client:
-                response = await client.get(self.pool.health_check_url)
-                response.raise_for_status()
-
-            elapsed_ms = (time.time() - start_time) * 1000
-            status.is_healthy = True
-            status.response_time_ms = elapsed_ms
-            status.last_check = time.time()
+            client = self._get_client(proxy_url)
+            # Bound the whole probe; httpx's timeouts are per phase
+            await asyncio.wait_for(self._probe(client), timeout=self.pool.timeout)
+
+            elapsed_ms = (time.monotonic() - start_time) * 1000
+            if self.pool.proxies.get(proxy_url) is not status:
+                return False  # Removed or quarantined while the probe ran
+            self._set_healthy(proxy_url, True)
+            self._record_response_time(status, elapsed_ms)
+            self._stamp_check(proxy_url, status)
             status.last_error = None
             return True
 
         except Exception as e:
-            status.is_healthy = False
-            status.last_check = time.time()
-            status.last_error = str(e)
+            if self.pool.proxies.get(proxy_url) is not status:
+                return False
+            self._set_healthy(proxy_url, False)
+            self._stamp_check(proxy_url, status)
+            if isinstance(e, asyncio.TimeoutError):
+                status.last_error = f"Health check timed out after {self.pool.timeout}s"
+            else:
+                status.last_error = str(e)
             return False
 
-    async def check_all_proxies(self, progress_callback=None) -> dict[str, bool]:
-        """Check all proxies and return results."""
+    async def _probe(self, client: httpx.AsyncClient):
+        """Request the health check URL without downloading a response body."""
+        url = self.pool.health_check_url
+        if not self._head_unsupported:
+            response = await client.head(url)
+            if response.status_code not in (405, 501):
+                response.raise_for_status()
+                return
+            self._head_unsupported = True
+
+        # HEAD not allowed - stream a GET and close it without reading the body
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+
+    def _get_client(self, proxy_url: str) -> httpx.AsyncClient:
+        """Get the pooled client for a proxy, creating it on first use."""
+        client = self._clients.get(proxy_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(proxy=proxy_url, retries=0, http2=HAS_H2),
+                timeout=self.pool.timeout,
+                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+            )
+            self._clients[proxy_url] = client
+        return client
+
+    async def aclose(self):
+        """Close all pooled health-check clients."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+
+    async def _check_with_sem(self, proxy_url: str) -> bool:
+        """Check a proxy once a concurrency slot is free."""
+        async with self._sem:
+            return await self.check_proxy(proxy_url)
+
+    async def _check_many(self, proxy_urls: list[str], progress_callback=None) -> dict[str, bool]:
+        """Check proxies concurrently, reporting progress as each one finishes."""
         results = {}
-        total = len(self.pool.proxies)
+        total = len(proxy_urls)
+        done = 0
 
-        for i, proxy_url in enumerate(self.pool.proxies.keys()):
-            is_healthy = await self.check_proxy(proxy_url)
+        async def check(proxy_url: str):
+            nonlocal done
+            is_healthy = await self._check_with_sem(proxy_url)
             results[proxy_url] = is_healthy
-
+            done += 1
             if progress_callback:
-                progress_callback(i + 1, total, proxy_url, is_healthy)
+                progress_callback(done, total, proxy_url, is_healthy)
 
-        return results
+        await asyncio.gather(*(check(url) for url in proxy_urls), return_exceptions=True)
+        # Keep results in pool order
+        return {url: results[url] for url in proxy_urls if url in results}
+
+    async def check_all_proxies(self, progress_callback=None) -> dict[str, bool]:
+        """Check all proxies and return results."""
+        return await self._check_many(list(self.pool.proxies), progress_callback)
+
+    def _stamp_check(self, proxy_url: str, status: ProxyStatus):
+        """Record that a proxy was just checked."""
+        status.last_check = time.monotonic()
+        heapq.heappush(self._by_check, (status.last_check, proxy_url))
+
+        # Compact once outdated entries dominate the heap
+        if len(self._by_check) > 4 * len(self.pool.proxies) + 64:
+            self._by_check = [(st.last_check, url) for url, st in self.pool.proxies.items()]
+            heapq.heapify(self._by_check)
 
     async def check_stale_proxies(self) -> list[str]:
         """Check proxies that haven't been checked recently."""
-        current_time = time.time()
+        cutoff = time.monotonic() - self.pool.health_check_interval
+        heap = self._by_check
         stale = []
-
-        for proxy_url, status in self.pool.proxies.items():
-            if current_time - status.last_check > self.pool.health_check_interval:
-                stale.append(proxy_url)
-                await self.check_proxy(proxy_url)
-
+        seen = set()
+
+        while heap and (not heap[0][0] or heap[0][0] < cutoff):
+            last_check, proxy_url = heapq.heappop(heap)
+            status = self.pool.proxies.get(proxy_url)
+            # Skip entries for removed proxies or superseded by a newer check
+            if status is None or status.last_check != last_check or proxy_url in seen:
+                continue
+            seen.add(proxy_url)
+            stale.append(proxy_url)
+
+        await self._check_many(stale)
+
+        # Requeue any proxy whose check never completed (e.g. cancelled)
+        for proxy_url in stale:
+            status = self.pool.proxies.get(proxy_url)
+            if status is not None and status.last_check < cutoff:
+                heapq.heappush(heap, (status.last_check, proxy_url))
         return stale
 
     def add_proxy(self, proxy_url: str):
-        """Add a new proxy to the pool."""
-        if proxy_url not in self.pool.proxies:
+        """Add a new proxy to the pool (quarantined proxies stay out until reset_all)."""
+        if proxy_url not in self.pool.proxies and proxy_url not in self._dead:
             self.pool.proxies[proxy_url] = ProxyStatus(url=proxy_url)
+            self._set_healthy(proxy_url, True)
+            heapq.heappush(self._by_check, (0, proxy_url))
+
+    def _detach(self, proxy_url: str) -> ProxyStatus:
+        """Take a proxy out of the pool, its totals and its pooled client."""
+        self._set_healthy(proxy_url, False)
+        status = self.pool.proxies.pop(proxy_url)
+        self._stats["success"] -= status.success_count
+        self._stats["fail"] -= status.fail_count
+        if status.response_time_ms > 0:
+            self._stats["rt_sum"] -= status.response_time_ms
+            self._stats["rt_n"] -= 1
+
+        client = self._clients.pop(proxy_url, None)
+        if client is not None:
+            try:
+                asyncio.get_running_loop().create_task(client.aclose())
+            except RuntimeError:
+                pass  # No loop running; the client is simply dropped
+        return status
 
     def remove_proxy(self, proxy_url: str):
         """Remove a proxy from the pool."""
         if proxy_url in self.pool.proxies:
-            del self.pool.proxies[proxy_url]
+            self._detach(proxy_url)
+        self._dead.pop(proxy_url, None)
 
     def reset_all(self):
-        """Reset all proxies to healthy state."""
-        for status in self.pool.proxies.values():
-            status.is_healthy = True
+        """Reset all proxies, including quarantined ones, to healthy state."""
+        for proxy_url, status in self._dead.items():
+            self.pool.proxies[proxy_url] = status
+            heapq.heappush(self._by_check, (status.last_check, proxy_url))
+            self._stats["success"] += status.success_count
+            if status.response_time_ms > 0:
+                self._stats["rt_sum"] += status.response_time_ms
+                self._stats["rt_n"] += 1
+        self._dead.clear()
+
+        for proxy_url, status in self.pool.proxies.items():
             status.fail_count = 0
             status.last_error = None
+            self._set_healthy(proxy_url, True)
+        self._stats["fail"] = 0
 
     def get_statistics(self) -> dict:
         """Get overall proxy pool statistics."""
         total = len(self.pool.proxies)
-        healthy = len(self.healthy_proxies)
-        total_success = sum(s.success_count for s in self.pool.proxies.values())
-        total_fail = sum(s.fail_count for s in self.pool.proxies.values())
-        avg_response = sum(
-            s.response_time_ms for s in self.pool.proxies.values() if s.response_time_ms > 0
-        ) / max(1, sum(1 for s in self.pool.proxies.values() if s.response_time_ms > 0))
+        healthy = len(self._healthy_set)
+        stats = self._stats
+        avg_response = stats["rt_sum"] / max(1, stats["rt_n"])
 
         return {
             "total": total,
             "healthy": healthy,
             "unhealthy": total - healthy,
-            "total_successes": total_success,
-            "total_failures": total_fail,
+            "quarantined": len(self._dead),
+            "total_successes": stats["success"],
+            "total_failures": stats["fail"],
             "average_response_ms": round(avg_response, 2)
         }
@@ -1,10 +1,18 @@
 """Job scheduler for Parsonic using APScheduler."""
 
 import asyncio
+import contextlib
+import hashlib
+import itertools
 import json
+import multiprocessing
+import operator
+import os
+import secrets
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Any, Optional, Callable
 from dataclasses import dataclass, field
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -14,12 +22,92 @@ from apscheduler.triggers.date import DateTrigger
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.asyncio import AsyncIOExecutor
 from PyQt6.QtCore import QObject, pyqtSignal
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 
 from src.models.project import ScraperProject
 from src.core.scraper import ScraperOrchestrator
+from src.core._serialize import json_default
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+# Job metadata changes within this window are written to disk together
+_SAVE_DELAY = 0.25  # seconds
+
+# Scheduled scrapes running at once, each in its own worker process
+DEFAULT_MAX_WORKERS = int(os.environ.get("PARSONIC_SCHEDULER_WORKERS", "2"))
+
+# ScheduledJob fields persisted to the jobs file and to the runtime sidecar
+_CONFIG_FIELDS = ('id', 'project_path', 'schedule_type', 'schedule_config', 'enabled')
+_RUNTIME_FIELDS = ('last_run', 'last_status', 'run_count')
+_config_values = operator.attrgetter(*_CONFIG_FIELDS)
+_runtime_values = operator.attrgetter(*_RUNTIME_FIELDS)
+
+
+# Job store engines by database path, shared by every scheduler in the process
+_ENGINE_CACHE: dict[Path, Engine] = {}
+
+
+def _sqlite_engine(db_path: Path) -> Engine:
+    """Get the job store engine for db_path, with WAL and relaxed fsync settings."""
+    db_path = db_path.resolve()
+    engine = _ENGINE_CACHE.get(db_path)
+    if engine is not None:
+        return engine
+
+    engine = create_engine(f'sqlite:///{db_path}', connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _record):
+        # WAL lets UI reads run alongside next_run_time writes, and with
+        # synchronous=NORMAL a trigger tick no longer waits on fsync
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.close()
+
+    _ENGINE_CACHE[db_path] = engine
+    return engine
+
+
+class _SharedEngineJobStore(SQLAlchemyJobStore):
+    """Job store whose engine is shared, so shutdown keeps its connections."""
+
+    def shutdown(self):
+        pass
+
+
+def _job_worker(project_path: str) -> tuple[int, int]:
+    """Run one scheduled scrape in a worker process; returns (successes, total)."""
+    async def run():
+        project = ScraperProject.load(project_path)
+        orchestrator = ScraperOrchestrator(project)
+        try:
+            results = await orchestrator.run()
+        finally:
+            await orchestrator.close()
+        return sum(1 for r in results if r.success), len(results)
+
+    return asyncio.run(run())
+
+
+def _job_process(project_path: str, conn):
+    """Worker process entry point; sends (ok, (successes, total) or error) back."""
+    try:
+        conn.send((True, _job_worker(project_path)))
+    except Exception as e:
+        conn.send((False, str(e)))
+    finally:
+        conn.close()
+
+
+@dataclass(slots=True)
 class ScheduledJob:
     """Represents a scheduled scraping job."""
     id: str
@@ -31,6 +119,9 @@ class ScheduledJob:
     last_status: Optional[str] = None
     run_count: int = 0
     created_at: datetime = field(default_factory=datetime.now)
+    # Trigger built from schedule_config, reused on every (re)schedule;
+    # reset to None if the schedule changes
+    _trigger: Any = field(default=None, repr=False, compare=False)
 
 
 class ScraperScheduler(QObject):
@@ -43,7 +134,7 @@ class ScraperScheduler(QObject):
     job_added = pyqtSignal(str)  # job_id
     job_removed = pyqtSignal(str)  # job_id
 
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", max_workers: int = DEFAULT_MAX_WORKERS):
         super().__init__()
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -51,7 +142,7 @@ class ScraperScheduler(QObject):
         # Job store
         db_path = self.data_dir / "scheduler.db"
         jobstores = {
-            'default': SQLAlchemyJobStore(url=f'sqlite:///{db_path}')
+            'default': _SharedEngineJobStore(engine=_sqlite_engine(db_path))
         }
 
         executors = {
@@ -71,48 +162,129 @@ class ScraperScheduler(QObject):
         )
 
         self._jobs: dict[str, ScheduledJob] = {}
+        # Seeded from the clock so IDs stay unique across restarts too
+        self._id_counter = itertools.count(int(time.time() * 1_000_000))
+        # Jobs run in worker processes so one job's parsing can't stall the
+        # others; each run's process is tracked so it can be terminated
+        self._max_workers = max(1, max_workers)
+        self._worker_slots: Optional[asyncio.Semaphore] = None
+        self._procs: dict[str, multiprocessing.Process] = {}
+        # Manual runs in flight; holding the tasks keeps them from being
+        # garbage collected mid-run
+        self._bg_tasks: set[asyncio.Task] = set()
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_pending = False
+        self._suspend_save = 0  # Nesting depth of batch_updates()
+        self._save_hashes: dict[str, bytes] = {}  # file name -> digest of last write
         self._load_jobs()
 
     def _load_jobs(self):
         """Load job metadata from disk."""
         jobs_file = self.data_dir / "scheduled_jobs.json"
+        runtime_file = self.data_dir / "scheduled_jobs.runtime.json"
         if jobs_file.exists():
             try:
-                with open(jobs_file, 'r') as f:
-                    data = json.load(f)
-                    for job_data in data:
-                        job = ScheduledJob(
-                            id=job_data['id'],
-                            project_path=job_data['project_path'],
-                            schedule_type=job_data['schedule_type'],
-                            schedule_config=job_data['schedule_config'],
-                            enabled=job_data.get('enabled', True),
-                            run_count=job_data.get('run_count', 0)
-                        )
-                        if job_data.get('last_run'):
-                            job.last_run = datetime.fromisoformat(job_data['last_run'])
-                        job.last_status = job_data.get('last_status')
-                        self._jobs[job.id] = job
+                data = self._read_json(jobs_file)
+                runtime = {}
+                if runtime_file.exists():
+                    runtime = self._read_json(runtime_file)
+                for job_data in data:
+                    # Files from before the runtime split keep run state inline
+                    state = runtime.get(job_data['id'], job_data)
+                    job = ScheduledJob(
+                        id=job_data['id'],
+                        project_path=job_data['project_path'],
+                        schedule_type=job_data['schedule_type'],
+                        schedule_config=job_data['schedule_config'],
+                        enabled=job_data.get('enabled', True),
+                        run_count=state.get('run_count', 0)
+                    )
+                    if state.get('last_run'):
+                        job.last_run = datetime.fromisoformat(state['last_run'])
+                    job.last_status = state.get('last_status')
+                    self._jobs[job.id] = job
             except Exception as e:
                 print(f"Error loading scheduled jobs: {e}")
 
     def _save_jobs(self):
-        """Save job metadata to disk."""
-        jobs_file = self.data_dir / "scheduled_jobs.json"
-        data = []
+        """Schedule a save of job metadata, coalescing bursts of changes."""
+        self._save_pending = True
+        if self._suspend_save:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to defer on - write straight away
+            self.flush()
+            return
+
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(_SAVE_DELAY, self.flush)
+
+    @contextlib.contextmanager
+    def batch_updates(self):
+        """
+        Group several job changes into a single save.
+
+        Use around multi-job operations, e.g. removing a selection:
+
+            with scheduler.batch_updates():
+                for job_id in selected:
+                    scheduler.remove_job(job_id)
+        """
+        self._suspend_save += 1
+        try:
+            yield self
+        finally:
+            self._suspend_save -= 1
+            if not self._suspend_save:
+                self.flush()
+
+    def flush(self):
+        """Write any pending job metadata to disk now."""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if not self._save_pending:
+            return
+        self._save_pending = False
+
+        # Job definitions rarely change; run state changes on every run and
+        # lives in a small sidecar so the main file is left alone
+        config = []
+        runtime = {}
         for job in self._jobs.values():
-            data.append({
-                'id': job.id,
-                'project_path': job.project_path,
-                'schedule_type': job.schedule_type,
-                'schedule_config': job.schedule_config,
-                'enabled': job.enabled,
-                'last_run': job.last_run.isoformat() if job.last_run else None,
-                'last_status': job.last_status,
-                'run_count': job.run_count
-            })
-        with open(jobs_file, 'w') as f:
-            json.dump(data, f, indent=2)
+            config.append(dict(zip(_CONFIG_FIELDS, _config_values(job))))
+            runtime[job.id] = dict(zip(_RUNTIME_FIELDS, _runtime_values(job)))
+        self._write_if_changed(self.data_dir / "scheduled_jobs.json", config)
+        self._write_if_changed(self.data_dir / "scheduled_jobs.runtime.json", runtime)
+
+    def _read_json(self, path: Path):
+        """Read a JSON file written by _write_if_changed."""
+        if HAS_ORJSON:
+            return orjson.loads(path.read_bytes())
+        return json.loads(path.read_bytes())
+
+    def _write_if_changed(self, path: Path, data):
+        """Atomically write data as JSON, skipping the write if unchanged."""
+        # orjson writes datetimes as ISO strings natively
+        if HAS_ORJSON:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2, default=json_default).encode()
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if self._save_hashes.get(path.name) == digest:
+            return
+
+        # Write to a temp file, sync it and swap it in, so neither a crash
+        # nor a power loss leaves a truncated or empty file behind
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._save_hashes[path.name] = digest
 
     def start(self):
         """Start the scheduler."""
@@ -128,6 +300,11 @@ class ScraperScheduler(QObject):
         """Stop the scheduler."""
         if self._scheduler.running:
             self._scheduler.shutdown(wait=False)
+        for task in list(self._bg_tasks):
+            task.cancel()
+        for proc in list(self._procs.values()):
+            proc.terminate()
+        self.flush()
 
     @property
     def is_running(self) -> bool:
@@ -143,7 +320,7 @@ class ScraperScheduler(QObject):
     ) -> str:
         """Add a new scheduled job."""
         if job_id is None:
-            job_id = f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            job_id = f"job_{next(self._id_counter):x}_{secrets.token_urlsafe(4)}"
 
         job = ScheduledJob(
             id=job_id,
@@ -163,7 +340,9 @@ class ScraperScheduler(QObject):
 
     def _add_job_to_scheduler(self, job: ScheduledJob):
         """Add job to APScheduler."""
-        trigger = self._create_trigger(job.schedule_type, job.schedule_config)
+        if job._trigger is None:
+            job._trigger = self._create_trigger(job.schedule_type, job.schedule_config)
+        trigger = job._trigger
         if trigger:
             self._scheduler.add_job(
                 self._run_job,
@@ -214,18 +393,13 @@ class ScraperScheduler(QObject):
         job.run_count += 1
 
         try:
-            # Load project
-            project = ScraperProject.load(job.project_path)
-
-            # Run scraper
-            orchestrator = ScraperOrchestrator(project)
-            results = await orchestrator.run()
-            await orchestrator.close()
-
-            success_count = sum(1 for r in results if r.success)
-            job.last_status = f"Success: {success_count}/{len(results)}"
+            if self._worker_slots is None:
+                self._worker_slots = asyncio.Semaphore(self._max_workers)
+            async with self._worker_slots:
+                success_count, total = await self._run_in_process(job_id, job.project_path)
+            job.last_status = f"Success: {success_count}/{total}"
 
-            self.job_completed.emit(job_id, True, len(results))
+            self.job_completed.emit(job_id, True, total)
 
         except Exception as e:
             job.last_status = f"Error: {str(e)}"
@@ -234,6 +408,38 @@ class ScraperScheduler(QObject):
         finally:
             self._save_jobs()
 
+    async def _run_in_process(self, job_id: str, project_path: str) -> tuple[int, int]:
+        """Load and run a project in its own worker process.
+
+        The process is terminated if the run is cancelled or the scheduler
+        stops, so no scrape outlives the app.
+        """
+        # spawn, not fork: forking a process that runs Qt threads is unsafe
+        ctx = multiprocessing.get_context("spawn")
+        recv_conn, send_conn = ctx.Pipe(duplex=False)
+        # Daemonic, so interpreter exit kills it rather than waiting on it
+        proc = ctx.Process(target=_job_process, args=(project_path, send_conn), daemon=True)
+        proc.start()
+        send_conn.close()
+        self._procs[job_id] = proc
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, proc.join)
+        except asyncio.CancelledError:
+            proc.terminate()
+            raise
+        finally:
+            if self._procs.get(job_id) is proc:
+                del self._procs[job_id]
+
+        try:
+            ok, value = recv_conn.recv() if recv_conn.poll() else (False, None)
+        finally:
+            recv_conn.close()
+        if not ok:
+            raise RuntimeError(value or f"Worker process exited with code {proc.exitcode}")
+        return value
+
     def remove_job(self, job_id: str):
         """Remove a scheduled job."""
         if job_id in self._jobs:
@@ -288,4 +494,6 @@ class ScraperScheduler(QObject):
     def run_job_now(self, job_id: str):
         """Run a job immediately."""
         if job_id in self._jobs:
-            asyncio.create_task(self._run_job(job_id))
+            task = asyncio.create_task(self._run_job(job_id))
+            self._bg_tasks.add(task)
+            task.add_done_callback(self._bg_tasks.discard)
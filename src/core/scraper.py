@@ -1,7 +1,10 @@
 """Scraper orchestrator that connects UI to engines."""
 
 import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union
+from urllib.parse import urljoin, urlparse, urlsplit
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from src.models.project import ScraperProject, SiteType
@@ -9,6 +12,111 @@ from src.engines.base import BaseEngine, ScrapeResult, RobotsWarning
 from src.engines.static_engine import StaticEngine
 from src.engines.js_engine import PlaywrightEngine
 
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+
+# Links to these are never followed during a crawl
+SKIP_EXTENSIONS = frozenset({
+    'pdf', 'jpg', 'jpeg', 'png', 'gif', 'webp', 'svg', 'ico',
+    'css', 'js', 'woff', 'woff2',
+})
+ALLOWED_SCHEMES = frozenset({'http', 'https'})
+# Link selectors that match exactly the <a> elements with an href
+PLAIN_LINK_SELECTORS = frozenset({'a', 'a[href]'})
+
+
+def _url_key(url: str) -> int:
+    """64-bit fingerprint of a URL, used to track seen URLs during a crawl."""
+    data = url.encode()
+    if HAS_XXHASH:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def _anchor_hrefs(html: str) -> Optional[list[str]]:
+    """href of every <a> in the page, read with lxml without building a soup.
+
+    Returns None if lxml cannot parse the page.
+    """
+    import lxml.html
+
+    try:
+        doc = lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(collect_ids=False))
+    except Exception:
+        return None
+    return [el.get('href') for el in doc.iter('a')]
+
+
+def _select_hrefs(html: str, selectors: list) -> tuple[list[str], list[str]]:
+    """href of every element matching the selectors; returns (hrefs, error messages)."""
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    hrefs = []
+    errors = []
+    try:
+        try:
+            soup = BeautifulSoup(html, 'lxml')
+        except FeatureNotFound:
+            soup = BeautifulSoup(html, 'html.parser')
+    except Exception as e:
+        return hrefs, [str(e)]
+
+    for selector in selectors:
+        try:
+            elements = selector.select(soup)
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        hrefs.extend(el.get('href') for el in elements)
+
+    return hrefs, errors
+
+
+def _extract_links_multi(html: str, base_url: str, selectors: list, same_domain: bool) -> tuple[list[str], list[str]]:
+    """Extract links from HTML matching any of the precompiled selectors, parsing the page once.
+
+    Safe to run off the event loop; returns (unique links in page order,
+    error messages).
+    """
+    hrefs = None
+    errors = []
+    # Plain anchor selectors skip the BeautifulSoup tree entirely
+    if selectors and all(s.pattern.strip() in PLAIN_LINK_SELECTORS for s in selectors):
+        hrefs = _anchor_hrefs(html)
+    if hrefs is None:
+        hrefs, errors = _select_hrefs(html, selectors)
+
+    links = []
+    found = set()
+    base_domain = urlparse(base_url).netloc
+    for href in hrefs:
+        if href:
+            # Make absolute URL
+            full_url = urljoin(base_url, href)
+            parts = urlsplit(full_url)
+
+            # Skip non-http links
+            if parts.scheme not in ALLOWED_SCHEMES:
+                continue
+
+            # Check same domain
+            if same_domain and parts.netloc != base_domain:
+                continue
+
+            # Skip anchors and common non-page URLs
+            if parts.fragment or parts.path.rpartition('.')[2].lower() in SKIP_EXTENSIONS:
+                continue
+
+            if full_url not in found:
+                found.add(full_url)
+                links.append(full_url)
+
+    return links, errors
+
 
 class ScraperOrchestrator(QObject):
     """Orchestrates scraping operations between UI and engines."""
@@ -27,6 +135,10 @@ class ScraperOrchestrator(QObject):
         self.project = project
         self._static_engine: Optional[StaticEngine] = None
         self._js_engine: Optional[PlaywrightEngine] = None
+        # Link extraction runs here so large pages don't stall the event loop
+        self._parse_pool: Optional[ThreadPoolExecutor] = None
+        # (link selectors, compiled selectors) from the last crawl
+        self._compiled_selectors: Optional[tuple[tuple[str, ...], list]] = None
         self._running = False
         self._paused = False
         self._stop_requested = False
@@ -158,39 +270,51 @@ class ScraperOrchestrator(QObject):
 
         self._running = True
         self._stop_requested = False
-        results = []
 
         engine_type = self._get_engine_type()
         crawl_enabled = self.project.link_follow.enabled
         link_selectors = self.project.link_follow.link_selectors  # Now a list
         max_pages = self.project.link_follow.max_depth if crawl_enabled else len(self.project.target.urls)
         same_domain = self.project.link_follow.same_domain_only
+        # Pages are fetched by several workers at once; the engine still
+        # applies its own rate limiting and connection cap
+        num_workers = max(1, min(self.project.rate_limit.max_concurrent, 20))
 
         # Debug crawl settings
         self.log.emit("info", f"Crawl enabled: {crawl_enabled}, selectors: {link_selectors}, max: {max_pages}")
 
-        # URL queue for crawling
-        url_queue = list(self.project.target.urls)
-        seen_urls = set(url_queue)
+        # URL queue for crawling, shared by the workers
+        url_queue: asyncio.Queue = asyncio.Queue()
+        for url in self.project.target.urls:
+            url_queue.put_nowait(url)
+        # Fingerprints rather than URL strings keep memory flat on big crawls
+        seen_urls = {_url_key(u) for u in self.project.target.urls}
+        pages_claimed = 0
         pages_scraped = 0
+        # Results by claim order, so output follows crawl order even though
+        # pages finish out of order
+        results_by_index: dict[int, ScrapeResult] = {}
+        # First unexpected error from a worker; re-raised once all stop
+        failure: Optional[BaseException] = None
 
         if crawl_enabled and link_selectors:
             self.log.emit("info", f"Starting crawl (max {max_pages} pages, engine: {engine_type})")
             self.log.emit("info", f"Following links matching: {', '.join(link_selectors)}")
         else:
-            self.log.emit("info", f"Starting scrape of {len(url_queue)} URLs (engine: {engine_type})")
+            self.log.emit("info", f"Starting scrape of {url_queue.qsize()} URLs (engine: {engine_type})")
             if crawl_enabled and not link_selectors:
                 self.log.emit("warning", "Crawl enabled but no link selectors specified!")
 
         engine = await self._get_engine()
+        loop = asyncio.get_running_loop()
+        compiled_selectors = []
+        if crawl_enabled and link_selectors:
+            compiled_selectors = self._compile_link_selectors(link_selectors)
+            if self._parse_pool is None:
+                self._parse_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="parsonic-links")
 
-        while url_queue and pages_scraped < max_pages:
-            if self._stop_requested:
-                self.log.emit("warning", "Scrape stopped by user")
-                break
-
-            url = url_queue.pop(0)
-            pages_scraped += 1
+        async def process(url: str, index: int):
+            nonlocal pages_scraped
 
             # Log current page being crawled
             self.log.emit("info", f"Crawling: {url}")
@@ -214,30 +338,31 @@ class ScraperOrchestrator(QObject):
                     await asyncio.sleep(0.1)
 
                 if self._stop_requested:
-                    break
+                    return
 
-            results.append(result)
+            results_by_index[index] = result
+            pages_scraped += 1
 
             # If crawling enabled, extract and queue new links
             if crawl_enabled and link_selectors:
                 if result.html:
-                    all_new_links = []
-                    for selector in link_selectors:
-                        links = self._extract_links(result.html, url, selector, same_domain)
-                        all_new_links.extend(links)
-
-                    # Deduplicate within this page's links
-                    all_new_links = list(dict.fromkeys(all_new_links))
+                    all_new_links, link_errors = await loop.run_in_executor(
+                        self._parse_pool, _extract_links_multi,
+                        result.html, url, compiled_selectors, same_domain
+                    )
+                    for message in link_errors:
+                        self.log.emit("warning", f"Error extracting links: {message}")
 
                     added = 0
                     for link in all_new_links:
-                        if link not in seen_urls:
-                            seen_urls.add(link)
-                            url_queue.append(link)
+                        key = _url_key(link)
+                        if key not in seen_urls:
+                            seen_urls.add(key)
+                            url_queue.put_nowait(link)
                             added += 1
 
                     if all_new_links:
-                        self.log.emit("info", f"Found {len(all_new_links)} links, added {added} new, {len(url_queue)} in queue")
+                        self.log.emit("info", f"Found {len(all_new_links)} links, added {added} new, {url_queue.qsize()} in queue")
                     else:
                         self.log.emit("warning", f"No links found matching selectors")
                 else:
@@ -263,47 +388,67 @@ class ScraperOrchestrator(QObject):
                 else:
                     self.log.emit("error", f"[{pages_scraped}/{len(self.project.target.urls)}] {url} - {result.error}")
 
-        self._running = False
-        self.completed.emit(results)
-        self.log.emit("info", f"Scrape completed: {sum(1 for r in results if r.success)}/{len(results)} successful")
-
-        return results
+        async def worker():
+            nonlocal pages_claimed, failure
+            while True:
+                url = await url_queue.get()
+                try:
+                    # Hold off while another page waits on a user decision
+                    while self._paused and not self._stop_requested:
+                        await asyncio.sleep(0.1)
+                    # Drain the rest of the queue once stopped or at the limit
+                    if self._stop_requested or failure or pages_claimed >= max_pages:
+                        continue
+                    index = pages_claimed
+                    pages_claimed += 1
+                    try:
+                        await process(url, index)
+                    except Exception as e:
+                        failure = e
+                finally:
+                    url_queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+        try:
+            # Done once the queue is drained and no worker still holds a page
+            # (a page in progress may add more links)
+            await url_queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
-    def _extract_links(self, html: str, base_url: str, selector: str, same_domain: bool) -> list[str]:
-        """Extract links from HTML matching the selector."""
-        from urllib.parse import urljoin, urlparse
-        from bs4 import BeautifulSoup
+        if failure:
+            self._running = False
+            raise failure
 
-        links = []
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
-            base_domain = urlparse(base_url).netloc
+        if self._stop_requested:
+            self.log.emit("warning", "Scrape stopped by user")
 
-            for el in soup.select(selector):
-                href = el.get('href')
-                if href:
-                    # Make absolute URL
-                    full_url = urljoin(base_url, href)
+        results = [results_by_index[i] for i in sorted(results_by_index)]
 
-                    # Skip non-http links
-                    if not full_url.startswith(('http://', 'https://')):
-                        continue
+        self._running = False
+        self.completed.emit(results)
+        self.log.emit("info", f"Scrape completed: {sum(1 for r in results if r.success)}/{len(results)} successful")
 
-                    # Check same domain
-                    if same_domain:
-                        link_domain = urlparse(full_url).netloc
-                        if link_domain != base_domain:
-                            continue
+        return results
 
-                    # Skip anchors and common non-page URLs
-                    if '#' in full_url or full_url.endswith(('.pdf', '.jpg', '.png', '.gif', '.css', '.js')):
-                        continue
+    def _compile_link_selectors(self, link_selectors: list[str]) -> list:
+        """Compile link selectors once per crawl, logging and skipping invalid ones."""
+        import soupsieve
 
-                    links.append(full_url)
-        except Exception as e:
-            self.log.emit("warning", f"Error extracting links: {e}")
+        key = tuple(link_selectors)
+        if self._compiled_selectors and self._compiled_selectors[0] == key:
+            return self._compiled_selectors[1]
 
-        return links
+        compiled = []
+        for selector in link_selectors:
+            try:
+                compiled.append(soupsieve.compile(selector))
+            except Exception as e:
+                self.log.emit("warning", f"Invalid link selector '{selector}': {e}")
+        self._compiled_selectors = (key, compiled)
+        return compiled
 
     async def perform_login(
         self,
@@ -377,3 +522,7 @@ class ScraperOrchestrator(QObject):
         if self._js_engine:
             await self._js_engine.close()
             self._js_engine = None
+
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=False)
+            self._parse_pool = None
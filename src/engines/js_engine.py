@@ -1,6 +1,7 @@
 """JavaScript rendering engine using Playwright for dynamic sites."""
 
 import asyncio
+import os
 import random
 import time
 import hashlib
@@ -22,6 +23,10 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
 ]
 
+# Pages opened in one browser context before it is swapped for a fresh one;
+# long-lived contexts slowly accumulate renderer memory
+CONTEXT_RECYCLE_AFTER = int(os.environ.get("PARSONIC_CONTEXT_RECYCLE_AFTER", "100"))
+
 
 class PlaywrightEngine(BaseEngine):
     """Engine for scraping JavaScript-rendered pages using Playwright."""
@@ -62,9 +67,19 @@ class PlaywrightEngine(BaseEngine):
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
+        # Fixed per engine so recycled contexts keep the same fingerprint
+        self._user_agent = random.choice(USER_AGENTS)
+        self._context_uses = 0
+        self._retired_contexts: list[BrowserContext] = []
+        self._recycle_lock = asyncio.Lock()
+        # Serialises browser startup across concurrent crawl workers
+        self._init_lock = asyncio.Lock()
         self._robots_cache: dict[str, bool] = {}
         self._seen_hashes: set[str] = set()
         self._consecutive_errors = 0
+        # Per-host pacing shared by concurrent requests
+        self._host_gates: dict[str, asyncio.Lock] = {}
+        self._host_next_request: dict[str, float] = {}
 
         # Proxy rotation
         self._proxy_index = 0
@@ -75,7 +90,10 @@ class PlaywrightEngine(BaseEngine):
 
     async def _init_browser(self):
         """Initialize Playwright browser."""
-        if self._playwright is None:
+        async with self._init_lock:
+            if self._playwright is not None:
+                return
+
             self._playwright = await async_playwright().start()
 
             # Browser launch options
@@ -90,33 +108,72 @@ class PlaywrightEngine(BaseEngine):
 
             self._browser = await self._playwright.chromium.launch(**launch_options)
 
-            # Context options
-            context_options = {
-                "user_agent": random.choice(USER_AGENTS),
-                "viewport": {"width": 1920, "height": 1080},
-                "locale": "en-US",
-                "timezone_id": "America/New_York",
-            }
-
-            # Add custom headers
-            if self.custom_headers:
-                context_options["extra_http_headers"] = self.custom_headers
-
-            # Load session storage if available
-            if self.session_storage_path:
-                try:
-                    context_options["storage_state"] = self.session_storage_path
-                except Exception:
-                    pass
-
-            self._context = await self._browser.new_context(**context_options)
-
-            # Apply stealth if enabled
-            if self.stealth_mode:
-                await self._apply_stealth(self._context)
+            self._context = await self._new_context(self.session_storage_path)
 
             self._semaphore = asyncio.Semaphore(self.rate_limit.max_concurrent)
 
+    async def _new_context(self, storage_state=None) -> BrowserContext:
+        """Create a browser context, optionally seeded with saved session state."""
+        # Context options
+        context_options = {
+            "user_agent": self._user_agent,
+            "viewport": {"width": 1920, "height": 1080},
+            "locale": "en-US",
+            "timezone_id": "America/New_York",
+        }
+
+        # Add custom headers
+        if self.custom_headers:
+            context_options["extra_http_headers"] = self.custom_headers
+
+        # Load session storage if available
+        if storage_state:
+            context_options["storage_state"] = storage_state
+
+        context = await self._browser.new_context(**context_options)
+
+        # Apply stealth if enabled
+        if self.stealth_mode:
+            await self._apply_stealth(context)
+
+        return context
+
+    async def _new_page(self) -> Page:
+        """Open a page, first recycling the context if it has been used enough."""
+        if self._context_uses >= CONTEXT_RECYCLE_AFTER:
+            await self._recycle_context()
+        self._context_uses += 1
+        return await self._context.new_page()
+
+    async def _recycle_context(self):
+        """Swap in a fresh context that carries over cookies and localStorage.
+
+        Pages still open in the old context finish there; it is closed once
+        its last page is released.
+        """
+        async with self._recycle_lock:
+            if self._context_uses < CONTEXT_RECYCLE_AFTER:
+                return  # another task already recycled
+            old = self._context
+            state = await old.storage_state()
+            self._context = await self._new_context(state)
+            self._context_uses = 0
+            self._retired_contexts.append(old)
+        await self._close_retired()
+
+    async def _release_page(self, page: Page):
+        """Close a page and any retired context it was keeping alive."""
+        await page.close()
+        if self._retired_contexts:
+            await self._close_retired()
+
+    async def _close_retired(self):
+        """Close retired contexts that have no open pages left."""
+        idle = [c for c in self._retired_contexts if not c.pages]
+        for context in idle:
+            self._retired_contexts.remove(context)
+            await context.close()
+
     async def _apply_stealth(self, context: BrowserContext):
         """Apply stealth techniques to avoid bot detection."""
         # Add init script to modify navigator properties
@@ -181,8 +238,12 @@ class PlaywrightEngine(BaseEngine):
         else:
             return available[0]
 
-    async def _wait_rate_limit(self):
-        """Apply rate limiting delay."""
+    async def _wait_rate_limit(self, url: str):
+        """Apply rate limiting delay.
+
+        Requests to one host are spaced at least the chosen delay apart,
+        however many run concurrently.
+        """
         if self.rate_limit.adaptive and self._consecutive_errors > 0:
             delay = min(
                 self.rate_limit.max_delay * (2 ** self._consecutive_errors),
@@ -191,8 +252,18 @@ class PlaywrightEngine(BaseEngine):
         else:
             delay = random.uniform(self.rate_limit.min_delay, self.rate_limit.max_delay)
 
-        if delay > 0:
-            await asyncio.sleep(delay)
+        if delay <= 0:
+            return
+
+        host = urlparse(url).netloc
+        gate = self._host_gates.get(host)
+        if gate is None:
+            gate = self._host_gates[host] = asyncio.Lock()
+        async with gate:
+            wait = self._host_next_request.get(host, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_next_request[host] = time.monotonic() + delay
 
     def _sanitize_value(self, value: str) -> str:
         """Clean up extracted values (remove mailto:, tel:, etc.)."""
@@ -284,7 +355,7 @@ class PlaywrightEngine(BaseEngine):
         start_time = time.time()
 
         # Rate limiting
-        await self._wait_rate_limit()
+        await self._wait_rate_limit(url)
 
         last_error = None
         html = None
@@ -293,7 +364,7 @@ class PlaywrightEngine(BaseEngine):
             page = None
             try:
                 async with self._semaphore:
-                    page = await self._context.new_page()
+                    page = await self._new_page()
 
                     # Set timeout
                     page.set_default_timeout(self.timeout * 1000)
@@ -349,7 +420,7 @@ class PlaywrightEngine(BaseEngine):
 
             finally:
                 if page:
-                    await page.close()
+                    await self._release_page(page)
 
             # Wait before retry
             if attempt < self.retry_count:
@@ -407,7 +478,7 @@ class PlaywrightEngine(BaseEngine):
 
         page = None
         try:
-            page = await self._context.new_page()
+            page = await self._new_page()
             page.set_default_timeout(self.timeout * 1000)
 
             await page.goto(url, wait_until=self.wait_for, timeout=self.timeout * 1000)
@@ -445,7 +516,7 @@ class PlaywrightEngine(BaseEngine):
 
         finally:
             if page:
-                await page.close()
+                await self._release_page(page)
 
     async def save_session(self, path: str):
         """Save current session (cookies, localStorage) to file."""
@@ -467,7 +538,7 @@ class PlaywrightEngine(BaseEngine):
 
         page = None
         try:
-            page = await self._context.new_page()
+            page = await self._new_page()
             page.set_default_timeout(self.timeout * 1000)
 
             await page.goto(login_url, wait_until="networkidle")
@@ -497,10 +568,14 @@ class PlaywrightEngine(BaseEngine):
 
         finally:
             if page:
-                await page.close()
+                await self._release_page(page)
 
     async def close(self):
         """Cleanup Playwright resources."""
+        for context in self._retired_contexts:
+            await context.close()
+        self._retired_contexts.clear()
+
         if self._context:
             await self._context.close()
             self._context = None
@@ -16,6 +16,29 @@ from src.engines.base import BaseEngine, ScrapeResult, RobotsWarning
 from src.models.project import SelectorField, RateLimitConfig, ProxyConfig
 
 
+# How long a fetched robots.txt is trusted (Google re-fetches daily), and how
+# soon to retry a host whose robots.txt could not be fetched
+ROBOTS_TTL = 24 * 3600.0
+ROBOTS_ERROR_TTL = 300.0
+
+
+def _has_shallow_rules(rp: RobotFileParser) -> bool:
+    """True if no robots.txt rule looks past the first path segment.
+
+    Rules are plain prefix matches, so with only such rules every URL under
+    the same top-level segment gets the same verdict.
+    """
+    entries = list(rp.entries)
+    if rp.default_entry:
+        entries.append(rp.default_entry)
+    # Rule paths are stored percent-quoted, so query/params/fragment
+    # separators appear as %3F/%3B/%23
+    return all(
+        "/" not in line.path[1:] and not any(sep in line.path.upper() for sep in ("%3F", "%3B", "%23"))
+        for entry in entries
+        for line in entry.rulelines
+    )
+
 # Common user agents for rotation
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -51,10 +74,18 @@ class StaticEngine(BaseEngine):
 
         # State
         self._client: Optional[httpx.AsyncClient] = None
-        self._robots_cache: dict[str, RobotFileParser] = {}
+        # base URL -> (fetched at, parser or None if robots.txt was unavailable)
+        self._robots_cache: dict[str, tuple[float, Optional[RobotFileParser]]] = {}
+        self._robots_fetches: dict[str, asyncio.Task] = {}
+        # base URL -> (parser, verdict by top-level path segment); the memo
+        # is None when the rules are too deep for segment-level verdicts
+        self._robots_verdicts: dict[str, tuple[RobotFileParser, Optional[dict[str, bool]]]] = {}
         self._seen_hashes: set[str] = set()
         self._request_times: list[float] = []
         self._consecutive_errors = 0
+        # Per-host pacing shared by concurrent requests
+        self._host_gates: dict[str, asyncio.Lock] = {}
+        self._host_next_request: dict[str, float] = {}
 
         # Proxy rotation state
         self._proxy_index = 0
@@ -104,8 +135,12 @@ class StaticEngine(BaseEngine):
         else:
             return available[0]
 
-    async def _wait_rate_limit(self):
-        """Apply rate limiting delay."""
+    async def _wait_rate_limit(self, url: str):
+        """Apply rate limiting delay.
+
+        Requests to one host are spaced at least the chosen delay apart,
+        however many run concurrently.
+        """
         if self.rate_limit.adaptive and self._consecutive_errors > 0:
             # Back off on errors
             delay = min(
@@ -115,8 +150,18 @@ class StaticEngine(BaseEngine):
         else:
             delay = random.uniform(self.rate_limit.min_delay, self.rate_limit.max_delay)
 
-        if delay > 0:
-            await asyncio.sleep(delay)
+        if delay <= 0:
+            return
+
+        host = urlparse(url).netloc
+        gate = self._host_gates.get(host)
+        if gate is None:
+            gate = self._host_gates[host] = asyncio.Lock()
+        async with gate:
+            wait = self._host_next_request.get(host, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_next_request[host] = time.monotonic() + delay
 
     def _sanitize_value(self, value: str) -> str:
         """Clean up extracted values (remove mailto:, tel:, etc.)."""
@@ -186,22 +231,9 @@ class StaticEngine(BaseEngine):
 
         parsed = urlparse(url)
         base_url = f"{parsed.scheme}://{parsed.netloc}"
-        robots_url = urljoin(base_url, "/robots.txt")
-
-        if base_url not in self._robots_cache:
-            try:
-                client = await self._get_client()
-                response = await client.get(robots_url, headers=self._get_headers())
 
-                rp = RobotFileParser()
-                rp.parse(response.text.splitlines())
-                self._robots_cache[base_url] = rp
-            except Exception:
-                # If we can't fetch robots.txt, assume everything is allowed
-                return None
-
-        rp = self._robots_cache.get(base_url)
-        if rp and not rp.can_fetch("*", url):
+        rp = await self._get_robots(base_url)
+        if rp and not self._robots_allowed(rp, base_url, parsed.path, url):
             return RobotsWarning(
                 url=url,
                 disallowed_paths=[parsed.path],
@@ -210,6 +242,56 @@ class StaticEngine(BaseEngine):
 
         return None
 
+    def _robots_allowed(self, rp: RobotFileParser, base_url: str, path: str, url: str) -> bool:
+        """can_fetch, memoized per top-level path segment where that is exact."""
+        cached = self._robots_verdicts.get(base_url)
+        if cached is None or cached[0] is not rp:
+            # New or re-fetched robots.txt
+            cached = (rp, {} if _has_shallow_rules(rp) else None)
+            self._robots_verdicts[base_url] = cached
+        verdicts = cached[1]
+        if verdicts is None:
+            return rp.can_fetch("*", url)
+
+        segment = path.split("/", 2)[1] if "/" in path else path
+        allowed = verdicts.get(segment)
+        if allowed is None:
+            allowed = verdicts[segment] = rp.can_fetch("*", url)
+        return allowed
+
+    async def _get_robots(self, base_url: str) -> Optional[RobotFileParser]:
+        """Get the parsed robots.txt for a host, fetching it at most once per TTL."""
+        entry = self._robots_cache.get(base_url)
+        if entry:
+            fetched_at, rp = entry
+            ttl = ROBOTS_TTL if rp else ROBOTS_ERROR_TTL
+            if time.monotonic() - fetched_at < ttl:
+                return rp
+
+        # Concurrent pages on the same host share one fetch
+        task = self._robots_fetches.get(base_url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_robots(base_url))
+            self._robots_fetches[base_url] = task
+            task.add_done_callback(lambda _t: self._robots_fetches.pop(base_url, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_robots(self, base_url: str) -> Optional[RobotFileParser]:
+        """Fetch and parse a host's robots.txt."""
+        robots_url = urljoin(base_url, "/robots.txt")
+        try:
+            client = await self._get_client()
+            response = await client.get(robots_url, headers=self._get_headers())
+
+            rp = RobotFileParser()
+            rp.parse(response.text.splitlines())
+        except Exception:
+            # If we can't fetch robots.txt, assume everything is allowed
+            rp = None
+
+        self._robots_cache[base_url] = (time.monotonic(), rp)
+        return rp
+
     async def scrape(
         self,
         url: str,
@@ -232,7 +314,7 @@ class StaticEngine(BaseEngine):
             )
 
         # Apply rate limiting
-        await self._wait_rate_limit()
+        await self._wait_rate_limit(url)
 
         # Retry loop
         last_error = None
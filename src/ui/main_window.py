@@ -554,6 +554,8 @@ class MainWindow(QMainWindow):
                 self._thermal_monitor.stop()
             if hasattr(self, '_thermal_timer'):
                 self._thermal_timer.stop()
+            # Write out any job changes still waiting on the save timer
+            self._scheduler.flush()
             event.accept()
         else:
             event.ignore()
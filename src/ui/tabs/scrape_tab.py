@@ -1578,7 +1578,8 @@ class ScrapeTab(QWidget):
             "Make sure Ollama is running:\n"
             "  ollama serve\n\n"
             "And models are installed:\n"
-            "  ollama pull qwen2.5-coder:7b"
+            "  ollama pull qwen2.5:3b-instruct-q4_K_M\n"
+            "  ollama pull qwen2.5-coder:7b-instruct-q4_K_M"
         )
 
     def _run_scrape(self):